@@ -0,0 +1,135 @@
+"""Persistent cache of generated CLI specifications."""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import Self
+
+from pydantic import ValidationError
+
+from cli_generator.models import CLISpec
+
+
+def default_cache_path() -> Path:
+    """Return the default location of the spec cache database."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cli-generator" / "specs.db"
+
+
+def spec_cache_key(model: str, description: str) -> str:
+    """Build the cache key for a (model, description) pair.
+
+    Descriptions are normalized (stripped and lowercased) so trivially
+    different phrasings of the same request share an entry.
+    """
+    normalized = description.strip().lower()
+    return hashlib.blake2b(f"{model}|{normalized}".encode()).hexdigest()
+
+
+class SpecCache:
+    """SQLite-backed cache mapping descriptions to generated CLISpecs."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database file to use. Defaults to
+                  ``~/.cache/cli-generator/specs.db``.
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        try:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS specs "
+                "(key TEXT PRIMARY KEY, spec_json TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            # e.g. an unwritable database file; don't leak the connection
+            self._conn.close()
+            raise
+
+    def get(self, model: str, description: str) -> CLISpec | None:
+        """Return the cached spec for a description, or None on a miss."""
+        row = self._conn.execute(
+            "SELECT spec_json FROM specs WHERE key = ?",
+            (spec_cache_key(model, description),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return CLISpec.model_validate_json(row[0])
+        except ValidationError:
+            # Entry was written by an older, incompatible schema
+            return None
+
+    def put(self, model: str, description: str, spec: CLISpec) -> None:
+        """Store the spec generated for a description."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO specs (key, spec_json) VALUES (?, ?)",
+            (spec_cache_key(model, description), spec.model_dump_json()),
+        )
+        self._conn.commit()
+
+    def delete(self, model: str, description: str) -> None:
+        """Drop the cached spec for a description, if any."""
+        self._conn.execute(
+            "DELETE FROM specs WHERE key = ?",
+            (spec_cache_key(model, description),),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        """Return the cache for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the cache when the ``with`` block exits."""
+        self.close()
+
+
+class LocalSpecCache:
+    """Per-project spec cache stored as JSON files in the output directory.
+
+    This is the first cache tier for ``cli-gen generate``: re-running the
+    same description against the same output directory reuses the spec
+    without touching the global SpecCache or the LLM.
+    """
+
+    DIRNAME = ".cli-gen-cache"
+
+    def __init__(self, output_dir: Path) -> None:
+        """Create a cache rooted in ``output_dir``.
+
+        Args:
+            output_dir: Directory the generated CLI is written to.
+        """
+        self.directory = Path(output_dir) / self.DIRNAME
+
+    def _path(self, model: str, description: str) -> Path:
+        """Return the JSON file holding the spec for a description."""
+        key = hashlib.sha256(f"{model}|{description}".encode()).hexdigest()[:16]
+        return self.directory / f"{key}.json"
+
+    def get(self, model: str, description: str) -> CLISpec | None:
+        """Return the cached spec for a description, or None on a miss."""
+        path = self._path(model, description)
+        if not path.exists():
+            return None
+
+        try:
+            return CLISpec.model_validate_json(path.read_bytes())
+        except ValidationError:
+            return None
+
+    def put(self, model: str, description: str, spec: CLISpec) -> None:
+        """Store the spec generated for a description."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(model, description).write_text(spec.model_dump_json(indent=2))
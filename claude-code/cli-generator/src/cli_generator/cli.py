@@ -1,72 +1,169 @@
-"""CLI interface for the CLI generator."""
+"""CLI interface for the CLI generator.
+
+Heavy dependencies (rich, pydantic-ai, the generators) are imported inside
+the functions that use them so that `--help` and shell completion stay fast.
+"""
+
+from __future__ import annotations
 
 import asyncio
+import atexit
 import json
 import os
 import sys
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import click
-from dotenv import load_dotenv
-from pydantic import ValidationError
-from pydantic_ai.models.test import TestModel
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
 
-from cli_generator.generators.code_generator import CodeGenerator
-from cli_generator.generators.spec_generator import SpecGenerator
-from cli_generator.models import CLISpec
+if TYPE_CHECKING:
+    from rich.console import Console
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Rich console for pretty output
-console = Console()
-error_console = Console(stderr=True)
+    from cli_generator.cache import SpecCache
+    from cli_generator.generators.spec_generator import SpecGenerator
+    from cli_generator.models import CLISpec
 
 # Version
 __version__ = "0.1.0"
 
+T = TypeVar("T")
+
+# Event loop shared by every generation in this process (see _run)
+_runner: asyncio.Runner | None = None
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the shared event loop.
+
+    The loop is created on first use and reused afterwards, so commands
+    that issue several generations pay for loop setup only once. At exit
+    it is shut down the way asyncio.run would (async generators, default
+    executor, then the loop itself).
+    """
+    global _runner
+    if _runner is None:
+        _runner = asyncio.Runner()
+        atexit.register(_runner.close)
+    return _runner.run(coro)
+
+
+@lru_cache(maxsize=None)
+def _console() -> Console:
+    """Return the shared Rich console for pretty output."""
+    from rich.console import Console
+
+    return Console()
+
+
+@lru_cache(maxsize=None)
+def _error_console() -> Console:
+    """Return the shared Rich console for error output."""
+    from rich.console import Console
+
+    return Console(stderr=True)
+
+
+def _status_console() -> Console:
+    """Return the console for progress messages.
+
+    That is stdout on a terminal and stderr otherwise, so piped stdout
+    carries only the command's data (e.g. `spec` JSON for `build -`).
+    """
+    console = _console()
+    return console if console.is_terminal else _error_console()
+
+
+def _load_env() -> None:
+    """Load environment variables (API keys) from a .env file."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
 
 def print_error(message: str) -> None:
     """Print an error message in red."""
-    error_console.print(f"[bold red]Error:[/bold red] {message}")
+    _error_console().print(f"[bold red]Error:[/bold red] {message}")
+
+
+def print_warning(message: str) -> None:
+    """Print a warning message in yellow."""
+    _error_console().print(f"[bold yellow]Warning:[/bold yellow] {message}")
 
 
 def print_success(message: str) -> None:
     """Print a success message in green."""
-    console.print(f"[bold green]✓[/bold green] {message}")
+    _status_console().print(f"[bold green]✓[/bold green] {message}")
 
 
 def print_info(message: str) -> None:
     """Print an info message."""
-    console.print(f"[bold blue]ℹ[/bold blue] {message}")
+    _status_console().print(f"[bold blue]ℹ[/bold blue] {message}")
 
 
 def print_spec_json(spec: CLISpec) -> None:
-    """Pretty print a CLISpec as JSON with syntax highlighting."""
+    """Pretty print a CLISpec as JSON with syntax highlighting.
+
+    When stdout is not a terminal the raw JSON is printed instead, which
+    skips Pygments lexing and keeps the output machine-readable.
+    """
     json_str = spec.model_dump_json(indent=2)
+
+    console = _console()
+    if not console.is_terminal:
+        click.echo(json_str)
+        return
+
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+
     syntax = Syntax(json_str, "json", theme="monokai", line_numbers=True)
     console.print(Panel(syntax, title="[bold]CLI Specification[/bold]", border_style="blue"))
 
 
 def print_spec_summary(spec: CLISpec) -> None:
-    """Print a summary table of the CLISpec."""
+    """Print a summary table of the CLISpec.
+
+    When stdout is not a terminal, plain tab-separated rows are printed to
+    stderr instead, skipping Rich's table layout and ANSI rendering and
+    keeping stdout free for data.
+    """
+    rows = [
+        (
+            cmd.name,
+            cmd.description,
+            ", ".join(arg.name for arg in cmd.arguments) or "-",
+            ", ".join(f"--{opt.name}" for opt in cmd.options) or "-",
+        )
+        for cmd in spec.commands
+    ]
+    global_opts = ", ".join(f"--{opt.name}" for opt in spec.global_options)
+
+    console = _console()
+    if not console.is_terminal:
+        click.echo(f"{spec.name} - {spec.description}", err=True)
+        for row in rows:
+            click.echo("\t".join(row), err=True)
+        if global_opts:
+            click.echo(
+                f"global\tAvailable to all commands\t-\t{global_opts}", err=True
+            )
+        return
+
+    from rich.table import Table
+
     table = Table(title=f"[bold]{spec.name}[/bold] - {spec.description}")
     table.add_column("Command", style="cyan")
     table.add_column("Description", style="white")
     table.add_column("Arguments", style="yellow")
     table.add_column("Options", style="green")
 
-    for cmd in spec.commands:
-        args = ", ".join(arg.name for arg in cmd.arguments) or "-"
-        opts = ", ".join(f"--{opt.name}" for opt in cmd.options) or "-"
-        table.add_row(cmd.name, cmd.description, args, opts)
+    for row in rows:
+        table.add_row(*row)
 
-    if spec.global_options:
-        global_opts = ", ".join(f"--{opt.name}" for opt in spec.global_options)
+    if global_opts:
         table.add_row("[dim]global[/dim]", "[dim]Available to all commands[/dim]", "-", f"[dim]{global_opts}[/dim]")
 
     console.print(table)
@@ -78,30 +175,48 @@ def cli() -> None:
     """Generate CLI tools from natural language descriptions.
 
     Use 'spec' to generate a specification, 'generate' to create a complete CLI,
-    or 'build' to generate from a saved spec file.
+    'build' to generate from a saved spec file, or 'batch' to create several
+    CLIs from a file of descriptions.
     """
     pass
 
 
 @cli.command("spec")
-@click.argument("description")
+@click.argument("description", required=False)
 @click.option(
     "--save", "-s",
     type=click.Path(),
-    help="Save spec to a JSON file",
+    help="Save spec to a JSON file (a directory when used with --batch)",
+)
+@click.option(
+    "--batch", "-b",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File of newline-delimited descriptions to generate concurrently",
 )
 @click.option(
     "--model", "-m",
     default="openai:gpt-4o-mini",
     help="Model to use for generation",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model instead of reusing cached specs",
+)
 @click.option(
     "--test-mode",
     is_flag=True,
     hidden=True,
     help="Use test model (for testing)",
 )
-def spec_cmd(description: str, save: str | None, model: str, test_mode: bool) -> None:
+def spec_cmd(
+    description: str | None,
+    save: str | None,
+    batch: str | None,
+    model: str,
+    no_cache: bool,
+    test_mode: bool,
+) -> None:
     """Generate a CLI specification from a description.
 
     DESCRIPTION is a natural language description of the CLI you want to create.
@@ -111,18 +226,26 @@ def spec_cmd(description: str, save: str | None, model: str, test_mode: bool) ->
         cli-gen spec "A CLI that converts images between formats"
 
         cli-gen spec "A file manager with list, copy, and delete commands" --save spec.json
+
+        cli-gen spec --batch descriptions.txt --save ./specs
     """
+    if batch is None and not description:
+        raise click.UsageError("Missing argument 'DESCRIPTION'.")
+    if batch is not None and description:
+        raise click.UsageError("DESCRIPTION cannot be combined with --batch.")
+
+    _load_env()
+
     try:
-        print_info(f"Generating CLI specification...")
+        with _create_spec_generator(model, test_mode, no_cache) as generator:
+            if batch is not None:
+                _spec_batch(generator, Path(batch), save)
+                return
 
-        # Create generator
-        if test_mode:
-            generator = SpecGenerator(model=TestModel())
-        else:
-            generator = SpecGenerator(model=model)
+            print_info(f"Generating CLI specification...")
 
-        # Run async generation
-        spec = asyncio.run(_generate_spec(generator, description))
+            # Run async generation
+            spec = _run(_generate_spec(generator, description))
 
         # Display the spec
         print_spec_json(spec)
@@ -139,11 +262,97 @@ def spec_cmd(description: str, save: str | None, model: str, test_mode: bool) ->
         sys.exit(1)
 
 
+@contextmanager
+def _create_spec_generator(
+    model: str, test_mode: bool, no_cache: bool
+) -> Iterator[SpecGenerator]:
+    """Yield a SpecGenerator, backed by the spec cache unless disabled.
+
+    The cache's database connection is closed when the block exits.
+    """
+    from cli_generator.generators.spec_generator import SpecGenerator
+
+    if test_mode:
+        from pydantic_ai.models.test import TestModel
+
+        # Never cache test model output alongside real specs
+        yield SpecGenerator(model=TestModel())
+        return
+
+    cache = None if no_cache else _open_spec_cache()
+    if cache is None:
+        yield SpecGenerator(model=model)
+    else:
+        with cache:
+            yield SpecGenerator(model=model, cache=cache)
+
+
+def _open_spec_cache() -> SpecCache | None:
+    """Open the global spec cache, or warn and return None if it can't be."""
+    import sqlite3
+
+    from cli_generator.cache import SpecCache
+
+    try:
+        return SpecCache()
+    except (OSError, sqlite3.Error) as e:
+        # The cache only saves model calls, so carry on without it
+        print_warning(f"Spec cache unavailable, continuing without it: {e}")
+        return None
+
+
 async def _generate_spec(generator: SpecGenerator, description: str) -> CLISpec:
     """Generate a CLISpec from description."""
     return await generator.generate(description)
 
 
+def _read_descriptions(batch_path: Path) -> list[str]:
+    """Read newline-delimited descriptions, skipping blank lines."""
+    descriptions = [
+        line.strip() for line in batch_path.read_text().splitlines() if line.strip()
+    ]
+    if not descriptions:
+        raise ValueError(f"No descriptions found in {batch_path}")
+    return descriptions
+
+
+def _unique_stems(specs: list[CLISpec]) -> list[str]:
+    """Name each spec's output after its CLI, suffixing repeats (name_2, ...).
+
+    Different descriptions can yield the same CLI name; without a suffix
+    their saved files or directories would overwrite each other.
+    """
+    seen: set[str] = set()
+    stems = []
+    for spec in specs:
+        stem, index = spec.name, 1
+        while stem in seen:
+            index += 1
+            stem = f"{spec.name}_{index}"
+        seen.add(stem)
+        stems.append(stem)
+    return stems
+
+
+def _spec_batch(generator: SpecGenerator, batch_path: Path, save: str | None) -> None:
+    """Generate specs for every description in a batch file."""
+    descriptions = _read_descriptions(batch_path)
+
+    print_info(f"Generating {len(descriptions)} CLI specifications...")
+    specs = _run(generator.generate_many(descriptions))
+
+    save_dir = Path(save) if save else None
+    if save_dir is not None:
+        save_dir.mkdir(parents=True, exist_ok=True)
+
+    for spec, stem in zip(specs, _unique_stems(specs)):
+        print_spec_summary(spec)
+        if save_dir is not None:
+            save_path = save_dir / f"{stem}.json"
+            save_path.write_text(spec.model_dump_json(indent=2))
+            print_success(f"Specification saved to {save_path}")
+
+
 @cli.command("generate")
 @click.argument("description")
 @click.option(
@@ -157,11 +366,21 @@ async def _generate_spec(generator: SpecGenerator, description: str) -> CLISpec:
     is_flag=True,
     help="Show spec without generating files",
 )
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Regenerate the spec even if a cached one exists",
+)
 @click.option(
     "--model", "-m",
     default="openai:gpt-4o-mini",
     help="Model to use for generation",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model instead of reusing cached specs",
+)
 @click.option(
     "--test-mode",
     is_flag=True,
@@ -172,7 +391,9 @@ def generate_cmd(
     description: str,
     output: str,
     dry_run: bool,
+    refresh: bool,
     model: str,
+    no_cache: bool,
     test_mode: bool,
 ) -> None:
     """Generate a complete CLI from a description.
@@ -187,17 +408,38 @@ def generate_cmd(
 
         cli-gen generate "A counter tool" --dry-run
     """
-    try:
-        print_info("Generating CLI specification...")
+    from rich.panel import Panel
+    from rich.table import Table
 
-        # Create spec generator
-        if test_mode:
-            spec_generator = SpecGenerator(model=TestModel())
-        else:
-            spec_generator = SpecGenerator(model=model)
+    from cli_generator.cache import LocalSpecCache
+    from cli_generator.generators.code_generator import CodeGenerator
+
+    _load_env()
 
-        # Generate spec
-        spec = asyncio.run(_generate_spec(spec_generator, description))
+    try:
+        # Create spec generator
+        with _create_spec_generator(model, test_mode, no_cache) as spec_generator:
+            # Two cache tiers: specs stored in the output directory, then the
+            # global SpecCache consulted by the generator itself
+            local_cache = None if no_cache else LocalSpecCache(Path(output))
+            spec = None
+            if local_cache is not None and not refresh:
+                spec = local_cache.get(spec_generator.model, description)
+
+            if spec is not None:
+                print_info(
+                    "Using cached specification (pass --refresh to regenerate)"
+                )
+            else:
+                print_info("Generating CLI specification...")
+                if refresh and spec_generator.cache is not None:
+                    spec_generator.cache.delete(spec_generator.model, description)
+
+                # Generate spec
+                spec = _run(_generate_spec(spec_generator, description))
+
+                if local_cache is not None and not dry_run:
+                    local_cache.put(spec_generator.model, description, spec)
 
         # Show the spec
         print_spec_json(spec)
@@ -214,9 +456,9 @@ def generate_cmd(
         result = code_generator.generate(spec, output_path)
 
         # Show results
-        console.print()
+        _console().print()
         print_success(f"CLI generated successfully in [bold]{output_path}[/bold]")
-        console.print()
+        _console().print()
 
         table = Table(title="Generated Files")
         table.add_column("Type", style="cyan")
@@ -225,11 +467,11 @@ def generate_cmd(
         for file_type, file_path in result.items():
             table.add_row(file_type, str(file_path))
 
-        console.print(table)
+        _console().print(table)
 
         # Print next steps
-        console.print()
-        console.print(Panel(
+        _console().print()
+        _console().print(Panel(
             f"[bold]Next steps:[/bold]\n\n"
             f"1. cd {output_path}\n"
             f"2. uv pip install -e .\n"
@@ -244,42 +486,70 @@ def generate_cmd(
 
 
 @cli.command("build")
-@click.argument("spec_file", type=click.Path(exists=True))
+@click.argument("spec_file", type=click.Path(exists=True, allow_dash=True))
 @click.option(
     "--output", "-o",
     type=click.Path(),
     default="./generated",
     help="Output directory for generated CLI",
 )
-def build_cmd(spec_file: str, output: str) -> None:
+@click.option(
+    "--trust",
+    is_flag=True,
+    hidden=True,
+    help="Skip validation for spec files known to be valid",
+)
+def build_cmd(spec_file: str, output: str, trust: bool) -> None:
     """Build a CLI from a saved specification file.
 
-    SPEC_FILE is a JSON file containing a CLI specification.
+    SPEC_FILE is a JSON file containing a CLI specification, or - to read
+    it from standard input.
 
     Examples:
 
         cli-gen build spec.json
 
         cli-gen build my-cli-spec.json --output ./my-cli
+
+        cli-gen spec "A counter tool" | cli-gen build -
     """
+    from pydantic import ValidationError
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from cli_generator.generators.code_generator import CodeGenerator
+    from cli_generator.models import CLISpec
+
     try:
-        spec_path = Path(spec_file)
+        if spec_file == "-":
+            source = "standard input"
+            spec_bytes = click.get_binary_stream("stdin").read()
+        else:
+            spec_path = Path(spec_file)
 
-        if not spec_path.exists():
-            print_error(f"File not found: {spec_path}")
-            sys.exit(1)
+            if not spec_path.exists():
+                print_error(f"File not found: {spec_path}")
+                sys.exit(1)
+
+            source = str(spec_path)
+            spec_bytes = spec_path.read_bytes()
 
-        print_info(f"Loading specification from {spec_path}...")
+        print_info(f"Loading specification from {source}...")
 
-        # Load and validate spec
+        # Load and validate spec (parsed straight from bytes by pydantic-core)
         try:
-            spec_data = json.loads(spec_path.read_text())
-            spec = CLISpec.model_validate(spec_data)
+            if trust:
+                spec = CLISpec.construct_trusted(**json.loads(spec_bytes))
+            else:
+                spec = CLISpec.model_validate_json(spec_bytes)
         except json.JSONDecodeError as e:
-            print_error(f"Invalid JSON in {spec_path}: {e}")
+            print_error(f"Invalid JSON in {source}: {e}")
             sys.exit(1)
         except ValidationError as e:
-            print_error(f"Invalid specification: {e}")
+            if e.errors()[0]["type"] == "json_invalid":
+                print_error(f"Invalid JSON in {source}: {e}")
+            else:
+                print_error(f"Invalid specification: {e}")
             sys.exit(1)
 
         # Show the spec
@@ -292,9 +562,9 @@ def build_cmd(spec_file: str, output: str) -> None:
         result = code_generator.generate(spec, output_path)
 
         # Show results
-        console.print()
+        _console().print()
         print_success(f"CLI generated successfully in [bold]{output_path}[/bold]")
-        console.print()
+        _console().print()
 
         table = Table(title="Generated Files")
         table.add_column("Type", style="cyan")
@@ -303,11 +573,11 @@ def build_cmd(spec_file: str, output: str) -> None:
         for file_type, file_path in result.items():
             table.add_row(file_type, str(file_path))
 
-        console.print(table)
+        _console().print(table)
 
         # Print next steps
-        console.print()
-        console.print(Panel(
+        _console().print()
+        _console().print(Panel(
             f"[bold]Next steps:[/bold]\n\n"
             f"1. cd {output_path}\n"
             f"2. uv pip install -e .\n"
@@ -321,12 +591,70 @@ def build_cmd(spec_file: str, output: str) -> None:
         sys.exit(1)
 
 
+@cli.command("batch")
+@click.argument("batch_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output", "-o",
+    type=click.Path(),
+    default="./generated",
+    help="Directory to create one CLI package directory in per description",
+)
+@click.option(
+    "--model", "-m",
+    default="openai:gpt-4o-mini",
+    help="Model to use for generation",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model instead of reusing cached specs",
+)
+@click.option(
+    "--test-mode",
+    is_flag=True,
+    hidden=True,
+    help="Use test model (for testing)",
+)
+def batch_cmd(batch_file: str, output: str, model: str, no_cache: bool, test_mode: bool) -> None:
+    """Generate several CLIs from a file of descriptions.
+
+    BATCH_FILE contains one natural language description per line. All
+    specifications are generated concurrently, then each CLI is written to
+    its own directory under --output.
+
+    Examples:
+
+        cli-gen batch descriptions.txt --output ./clis
+    """
+    from cli_generator.generators.code_generator import CodeGenerator
+
+    _load_env()
+
+    try:
+        descriptions = _read_descriptions(Path(batch_file))
+        print_info(f"Generating {len(descriptions)} CLI specifications...")
+        with _create_spec_generator(model, test_mode, no_cache) as spec_generator:
+            specs = _run(spec_generator.generate_many(descriptions))
+
+        code_generator = CodeGenerator()
+        output_path = Path(output)
+        for spec, stem in zip(specs, _unique_stems(specs)):
+            print_spec_summary(spec)
+            cli_dir = output_path / stem
+            code_generator.generate(spec, cli_dir)
+            print_success(f"{spec.name} generated in [bold]{cli_dir}[/bold]")
+
+    except Exception as e:
+        print_error(str(e))
+        sys.exit(1)
+
+
 def main() -> None:
     """Entry point for the CLI."""
     try:
         cli()
     except KeyboardInterrupt:
-        error_console.print("\n[yellow]Operation cancelled[/yellow]")
+        _error_console().print("\n[yellow]Operation cancelled[/yellow]")
         sys.exit(130)
     except Exception as e:
         print_error(f"Unexpected error: {e}")
@@ -1,6 +1,23 @@
 """Generator modules for CLI specification and code generation."""
 
-from cli_generator.generators.code_generator import CodeGenerator
-from cli_generator.generators.spec_generator import SpecGenerator
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["CodeGenerator", "SpecGenerator"]
+from cli_generator.generators.code_generator import CodeGenerator, GeneratedFile
+
+if TYPE_CHECKING:
+    from cli_generator.generators.spec_generator import SpecGenerator
+
+__all__ = ["CodeGenerator", "GeneratedFile", "SpecGenerator"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import SpecGenerator on first access.
+
+    It pulls in pydantic-ai, which code generation alone (e.g. `build`)
+    never needs.
+    """
+    if name == "SpecGenerator":
+        from cli_generator.generators.spec_generator import SpecGenerator
+
+        return SpecGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
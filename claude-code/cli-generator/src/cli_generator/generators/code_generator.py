@@ -1,12 +1,93 @@
 """Generate Python/Click code from CLISpec."""
 
+import string
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    PackageLoader,
+    select_autoescape,
+)
+from pydantic_core import PydanticSerializationError
 
 from cli_generator.models import ArgumentSpec, CLISpec, OptionSpec
 
+# Maps dashes and spaces to underscores and lowercases ASCII in a single pass
+_IDENTIFIER_TABLE = str.maketrans(
+    {"-": "_", " ": "_", **{c: c.lower() for c in string.ascii_uppercase}}
+)
+
+
+def _to_identifier(name: str) -> str:
+    """Convert a spec name to a lowercase Python identifier."""
+    converted = name.translate(_IDENTIFIER_TABLE)
+    # The table only covers ASCII letters; other scripts need a full lower()
+    return converted if converted.isascii() else converted.lower()
+
+
+@lru_cache(maxsize=1024)
+def _to_func_name(name: str) -> str:
+    """Convert a command name to a valid Python function name."""
+    return _to_identifier(name)
+
+
+@lru_cache(maxsize=1024)
+def _to_param_name(name: str) -> str:
+    """Convert an option/argument name to a valid Python parameter name."""
+    return _to_identifier(name)
+
+
+def _write_file(path: Path, text: str) -> None:
+    """Write a generated file to disk, creating its directory if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@dataclass(frozen=True, slots=True)
+class GeneratedFile:
+    """A file written by CodeGenerator, with the text that was written.
+
+    Behaves like its path for ``os.fspath``, ``str`` and ``exists()``, so
+    callers that treated generate() results as paths keep working.
+    """
+
+    path: Path
+    text: str
+
+    def __fspath__(self) -> str:
+        """Return the file path, so the result works with ``open()`` etc."""
+        return str(self.path)
+
+    def __str__(self) -> str:
+        """Return the file path as a string."""
+        return str(self.path)
+
+    def exists(self) -> bool:
+        """Return whether the file is on disk."""
+        return self.path.exists()
+
+    def read_text(self) -> str:
+        """Read the file back from disk (use ``text`` to skip the read)."""
+        return self.path.read_text()
+
+
+@dataclass(frozen=True, slots=True)
+class _RenderKey:
+    """Render-cache key: a spec, compared and hashed by its JSON dump alone.
+
+    Pydantic equality treats e.g. ``default=1`` and ``default=1.0`` as equal,
+    but they render differently; their dumps do not collide.
+    """
+
+    spec_json: str
+    spec: CLISpec = field(compare=False)
+
 
 class CodeGenerator:
     """Generate Python/Click code from CLISpec using Jinja2 templates."""
@@ -18,24 +99,18 @@ class CodeGenerator:
             autoescape=select_autoescape(),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates ship with the package, so skip per-render stat checks
+            # and reuse compiled bytecode across runs (per-user temp dir)
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache(),
         )
         # Register custom filters
-        self.env.filters["to_func_name"] = self._to_func_name
-        self.env.filters["to_param_name"] = self._to_param_name
+        self.env.filters["to_param_name"] = _to_param_name
         self.env.filters["python_type"] = self._python_type
-        # Register custom functions
-        self.env.globals["render_option"] = self._render_option
-        self.env.globals["render_argument"] = self._render_argument
-
-    @staticmethod
-    def _to_func_name(name: str) -> str:
-        """Convert a command name to a valid Python function name."""
-        return name.replace("-", "_").replace(" ", "_").lower()
-
-    @staticmethod
-    def _to_param_name(name: str) -> str:
-        """Convert an option/argument name to a valid Python parameter name."""
-        return name.replace("-", "_").replace(" ", "_").lower()
+        # Compile templates once per generator instead of once per render
+        self._cli_template = self.env.get_template("cli.py.j2")
+        # Rendering is pure, so identical specs reuse the previous render
+        self._cached_render = lru_cache(maxsize=32)(self._render_key)
 
     @staticmethod
     def _python_type(spec: ArgumentSpec | OptionSpec) -> str:
@@ -58,141 +133,96 @@ class CodeGenerator:
 
         return base_type
 
-    @staticmethod
-    def _render_option(option: OptionSpec) -> str:
-        """Render a @click.option decorator for an option."""
-        parts = ["@click.option("]
-
-        # Option names
-        if option.short:
-            parts.append(f'"-{option.short}", ')
-        parts.append(f'"--{option.name}"')
-
-        # Type handling
-        if option.type == "bool":
-            parts.append(", is_flag=True")
-        elif option.type == "int":
-            parts.append(", type=int")
-        elif option.type == "float":
-            parts.append(", type=float")
-        elif option.type == "path":
-            parts.append(", type=click.Path()")
-        elif option.type == "choice":
-            choices_str = ", ".join(f'"{c}"' for c in (option.choices or []))
-            parts.append(f", type=click.Choice([{choices_str}])")
-
-        # Default value
-        if option.default is not None and option.type != "bool":
-            if isinstance(option.default, str):
-                parts.append(f', default="{option.default}"')
-            else:
-                parts.append(f", default={option.default}")
-
-        # Required flag
-        if option.required:
-            parts.append(", required=True")
-
-        # Help text
-        if option.help:
-            # Escape quotes in help text
-            help_text = option.help.replace('"', '\\"')
-            parts.append(f', help="{help_text}"')
-
-        parts.append(")")
-
-        return "".join(parts)
-
-    @staticmethod
-    def _render_argument(arg: ArgumentSpec) -> str:
-        """Render a @click.argument decorator for an argument."""
-        parts = [f'@click.argument("{arg.name}"']
-
-        # Type handling
-        if arg.type == "int":
-            parts.append(", type=int")
-        elif arg.type == "float":
-            parts.append(", type=float")
-        elif arg.type == "path":
-            parts.append(", type=click.Path(exists=True)")
-
-        # Required flag (arguments are required by default in Click)
-        if not arg.required:
-            parts.append(", required=False")
-
-        parts.append(")")
-
-        return "".join(parts)
-
     def _has_path_types(self, spec: CLISpec) -> bool:
         """Check if the spec uses any path types that require Path import."""
-        # Check global options
-        for opt in spec.global_options:
-            if opt.type == "path":
-                return True
-
-        # Check commands
-        for cmd in spec.commands:
-            for arg in cmd.arguments:
-                if arg.type == "path":
-                    return True
-            for opt in cmd.options:
-                if opt.type == "path":
-                    return True
-
-        return False
-
-    def generate(self, spec: CLISpec, output_dir: Path) -> dict[str, Path]:
+        return any(
+            "path" in cmd.columns.arg_types or "path" in cmd.columns.opt_types
+            for cmd in spec.commands
+        ) or any(opt.type == "path" for opt in spec.global_options)
+
+    def generate(
+        self,
+        spec: CLISpec,
+        output_dir: Path,
+        writer: Callable[[Path, str], object] = _write_file,
+    ) -> dict[str, GeneratedFile]:
         """Generate CLI code from a CLISpec.
 
         Args:
             spec: The CLI specification to generate code from.
             output_dir: Directory to write generated files to.
+            writer: Called with each file's path and text to write it.
+                Defaults to writing to disk, creating directories as needed;
+                tests can collect files in memory instead, leaving the disk
+                untouched.
 
         Returns:
-            Dict mapping file type to path (cli, init, pyproject, readme).
+            Dict mapping file type (cli, init, pyproject, readme) to the
+            written file's path and text.
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create package directory
+        # Directories are created by the writer, so in-memory runs skip them
         package_dir = output_dir / spec.name
-        package_dir.mkdir(exist_ok=True)
-
-        result: dict[str, Path] = {}
-
-        # Generate cli.py
-        cli_path = package_dir / "cli.py"
-        cli_content = self._generate_cli(spec)
-        cli_path.write_text(cli_content)
-        result["cli"] = cli_path
-
-        # Generate __init__.py
-        init_path = package_dir / "__init__.py"
-        init_content = self._generate_init(spec)
-        init_path.write_text(init_content)
-        result["init"] = init_path
 
-        # Generate pyproject.toml
-        pyproject_path = output_dir / "pyproject.toml"
-        pyproject_content = self._generate_pyproject(spec)
-        pyproject_path.write_text(pyproject_content)
-        result["pyproject"] = pyproject_path
+        # Render everything first, then write the independent files concurrently
+        rendered = self._render(spec)
+        files = {
+            "cli": GeneratedFile(package_dir / "cli.py", rendered["cli"]),
+            "init": GeneratedFile(package_dir / "__init__.py", rendered["init"]),
+            "pyproject": GeneratedFile(
+                output_dir / "pyproject.toml", rendered["pyproject"]
+            ),
+            "readme": GeneratedFile(output_dir / "README.md", rendered["readme"]),
+        }
 
-        # Generate README.md
-        readme_path = output_dir / "README.md"
-        readme_content = self._generate_readme(spec)
-        readme_path.write_text(readme_content)
-        result["readme"] = readme_path
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            writes = [
+                executor.submit(writer, file.path, file.text)
+                for file in files.values()
+            ]
+            for write in writes:
+                write.result()
+
+        return files
+
+    def _render(self, spec: CLISpec) -> dict[str, str]:
+        """Render every generated file, reusing the render of an identical spec."""
+        try:
+            key = _RenderKey(spec.model_dump_json(), spec)
+        except PydanticSerializationError:
+            # Defaults JSON can't represent leave no exact key, so skip the cache
+            return self._render_files(spec)
+        return self._cached_render(key)
+
+    def _render_key(self, key: _RenderKey) -> dict[str, str]:
+        """Render the files for a cache key's spec."""
+        return self._render_files(key.spec)
+
+    def _render_files(self, spec: CLISpec) -> dict[str, str]:
+        """Render the content of every generated file, keyed by file type."""
+        # Derived values shared by every file, computed in one pass over the spec
+        context = self._build_context(spec)
+        return {
+            "cli": self._generate_cli(spec, context),
+            "init": self._generate_init(spec),
+            "pyproject": self._generate_pyproject(spec, context),
+            "readme": self._generate_readme(spec),
+        }
 
-        return result
+    def _build_context(self, spec: CLISpec) -> dict[str, Any]:
+        """Compute the values shared by all generated files."""
+        deps = ["click>=8.1", *spec.dependencies]
+        return {
+            "has_path_types": self._has_path_types(spec),
+            "deps_str": ",\n    ".join(f'"{d}"' for d in deps),
+            "func_names": {
+                cmd.name: _to_func_name(cmd.name) for cmd in spec.commands
+            },
+        }
 
-    def _generate_cli(self, spec: CLISpec) -> str:
+    def _generate_cli(self, spec: CLISpec, context: dict[str, Any]) -> str:
         """Generate the cli.py file content."""
-        template = self.env.get_template("cli.py.j2")
-        return template.render(
-            cli=spec,
-            has_path_types=self._has_path_types(spec),
-        )
+        return self._cli_template.render(cli=spec, **context)
 
     def _generate_init(self, spec: CLISpec) -> str:
         """Generate the __init__.py file content."""
@@ -201,20 +231,15 @@ class CodeGenerator:
 __version__ = "0.1.0"
 '''
 
-    def _generate_pyproject(self, spec: CLISpec) -> str:
+    def _generate_pyproject(self, spec: CLISpec, context: dict[str, Any]) -> str:
         """Generate the pyproject.toml file content."""
-        # Collect dependencies
-        deps = ["click>=8.1"]
-        deps.extend(spec.dependencies)
-        deps_str = ",\n    ".join(f'"{d}"' for d in deps)
-
         return f'''[project]
 name = "{spec.name}"
 version = "0.1.0"
 description = "{spec.description}"
 requires-python = ">={spec.python_version}"
 dependencies = [
-    {deps_str},
+    {context["deps_str"]},
 ]
 
 [project.scripts]
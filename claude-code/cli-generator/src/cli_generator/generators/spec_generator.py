@@ -1,12 +1,22 @@
 """Generate CLISpec from natural language descriptions using PydanticAI."""
 
-from typing import Union
+import asyncio
+from typing import TYPE_CHECKING, Union
 
 from pydantic_ai import Agent
 from pydantic_ai.models import Model
 
+from cli_generator.cache import SpecCache
 from cli_generator.models import CLISpec, CommandSpec
 
+if TYPE_CHECKING:
+    # Importing these at runtime would require both provider SDKs
+    from pydantic_ai.models.anthropic import AnthropicModelSettings
+    from pydantic_ai.models.openai import OpenAIChatModelSettings
+
+    class _PromptCacheSettings(AnthropicModelSettings, OpenAIChatModelSettings):
+        """Model settings understood by both the Anthropic and OpenAI models."""
+
 
 # System prompt that guides the LLM to generate good CLI specifications
 SYSTEM_PROMPT = """You are an expert CLI designer. Your task is to convert natural language
@@ -80,24 +90,46 @@ descriptions into well-structured CLI specifications.
 Keep it simple - only include options that are actually needed for the described functionality.
 """
 
+# Provider settings that let repeated calls reuse the cached SYSTEM_PROMPT prefix.
+# Anthropic needs explicit cache breakpoints; OpenAI caches stable prefixes
+# automatically and the key routes our requests to the same cache. Settings
+# for other providers are ignored.
+PROMPT_CACHE_SETTINGS: "_PromptCacheSettings" = {
+    "anthropic_cache_instructions": True,
+    "anthropic_cache_tool_definitions": True,
+    "openai_prompt_cache_key": "cli-generator",
+}
+
 
 class SpecGenerator:
     """Generate CLISpec from natural language descriptions using an LLM."""
 
-    def __init__(self, model: Union[str, Model] = "openai:gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        model: Union[str, Model] = "openai:gpt-4o-mini",
+        cache: SpecCache | None = None,
+    ) -> None:
         """Initialize the generator with a model.
 
         Args:
             model: The model identifier string (e.g., "openai:gpt-4o-mini",
                    "anthropic:claude-3-5-sonnet-latest") or a Model instance
                    (e.g., TestModel for testing).
+            cache: Optional spec cache consulted before calling the LLM.
+                   Entries are keyed on ``model``, so leave it unset when the
+                   agents' model is swapped with ``agent.override()``.
         """
-        self.model = model if isinstance(model, str) else str(type(model).__name__)
+        # Identifies the model in cache keys, e.g. "openai:gpt-4o-mini"
+        self.model = (
+            model if isinstance(model, str) else f"{model.system}:{model.model_name}"
+        )
         self._model_instance = model
+        self.cache = cache
         self.agent = Agent(
             model,
             output_type=CLISpec,
             system_prompt=SYSTEM_PROMPT,
+            model_settings=PROMPT_CACHE_SETTINGS,
             defer_model_check=True,
         )
         # Separate agent for generating individual commands
@@ -105,6 +137,7 @@ class SpecGenerator:
             model,
             output_type=CommandSpec,
             system_prompt=SYSTEM_PROMPT,
+            model_settings=PROMPT_CACHE_SETTINGS,
             defer_model_check=True,
         )
 
@@ -131,11 +164,42 @@ class SpecGenerator:
         if not description or not description.strip():
             raise ValueError("description cannot be empty")
 
+        if self.cache is not None:
+            cached = self.cache.get(self.model, description)
+            if cached is not None:
+                return cached
+
         result = await self.agent.run(
             f"Create a CLI specification for: {description}"
         )
+
+        if self.cache is not None:
+            self.cache.put(self.model, description, result.output)
+
         return result.output
 
+    async def generate_many(self, descriptions: list[str]) -> list[CLISpec]:
+        """Generate CLISpecs for several descriptions concurrently.
+
+        All LLM calls are issued at once so their network latency overlaps
+        instead of accumulating one round-trip per description.
+
+        Args:
+            descriptions: Natural language descriptions, one per CLI.
+
+        Returns:
+            CLISpec objects in the same order as the descriptions.
+
+        Raises:
+            ValueError: If any description is empty or whitespace only.
+        """
+        if any(not d or not d.strip() for d in descriptions):
+            raise ValueError("description cannot be empty")
+
+        return list(
+            await asyncio.gather(*(self.generate(d) for d in descriptions))
+        )
+
     async def add_command(self, spec: CLISpec, description: str) -> CLISpec:
         """Add a new command to an existing CLISpec.
 
@@ -147,7 +211,8 @@ class SpecGenerator:
             A new CLISpec with the command added.
 
         Raises:
-            ValueError: If description is empty or whitespace only.
+            ValueError: If description is empty or whitespace only, or the
+                generated command's name is already taken.
         """
         if not description or not description.strip():
             raise ValueError("description cannot be empty")
@@ -163,14 +228,12 @@ New command request: {description}
 Generate a CommandSpec for this new command that fits well with the existing CLI."""
         )
 
-        # Create a new CLISpec with the command added
-        new_commands = list(spec.commands) + [result.output]
+        new_command = result.output
 
-        return CLISpec(
-            name=spec.name,
-            description=spec.description,
-            commands=new_commands,
-            global_options=spec.global_options,
-            python_version=spec.python_version,
-            dependencies=spec.dependencies,
-        )
+        # The command agent already validated the new CommandSpec and the rest
+        # of the spec is unchanged, so only the new name needs checking
+        if any(cmd.name == new_command.name for cmd in spec.commands):
+            raise ValueError(f"Duplicate command names: {new_command.name!r}")
+
+        # Copy the spec with the command added, skipping full re-validation
+        return spec.model_copy(update={"commands": (*spec.commands, new_command)})
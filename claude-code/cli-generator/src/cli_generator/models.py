@@ -1,22 +1,133 @@
 """Pydantic models for CLI specification."""
 
 import keyword
-import re
-from typing import Any
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from operator import attrgetter
+from typing import Any, Self
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
-def sanitize_name(name: str) -> str:
-    """Remove leading dashes and clean up option/argument names."""
-    # Strip leading dashes (e.g., "--output" -> "output", "-o" -> "o")
-    cleaned = name.lstrip("-")
-    # Replace remaining dashes with underscores for Python compatibility
-    # but keep single dashes in multi-word options like "output-dir"
-    return cleaned
+# Key functions for _check_unique
+_NAME = attrgetter("name")
+_SHORT = attrgetter("short")
 
 
-class ArgumentSpec(BaseModel):
+def _check_unique(items: Iterable[Any], key: Callable[[Any], Any], label: str) -> None:
+    """Raise ValueError on the first item whose key has already been seen.
+
+    Items whose key is None (e.g. options without a short name) are skipped.
+
+    Args:
+        items: Specs to check
+        key: Extracts the value that must be unique (e.g. the name)
+        label: Plural description used in the error message
+
+    Raises:
+        ValueError: On the first duplicate key
+    """
+    seen = set()
+    for item in items:
+        value = key(item)
+        if value is None:
+            continue
+        if value in seen:
+            raise ValueError(f"Duplicate {label}: {value!r}")
+        seen.add(value)
+
+
+def _construct_all(model: Any, items: Iterable[Any]) -> tuple[Any, ...]:
+    """Trusted-construct each dict in ``items``; model instances pass through."""
+    return tuple(
+        model.construct_trusted(**item) if isinstance(item, dict) else item
+        for item in items
+    )
+
+
+def _freeze(data: dict[str, Any], *fields: str) -> dict[str, Any]:
+    """Convert the given list fields of ``data`` to tuples, in place."""
+    for field in fields:
+        if isinstance(data.get(field), list):
+            data[field] = tuple(data[field])
+    return data
+
+
+# Click type keyword fragments, keyed by spec type ("choice" is built per option)
+_OPTION_TYPE_FRAGMENTS = {
+    "bool": ", is_flag=True",
+    "int": ", type=int",
+    "float": ", type=float",
+    "path": ", type=click.Path()",
+}
+_ARGUMENT_TYPE_FRAGMENTS = {
+    "int": ", type=int",
+    "float": ", type=float",
+    "path": ", type=click.Path(exists=True)",
+}
+
+
+def _render_option(option: "OptionSpec") -> str:
+    """Render a @click.option decorator for an option."""
+    short_part = f'"-{option.short}", ' if option.short else ""
+
+    if option.type == "choice":
+        choices_str = ", ".join(f'"{c}"' for c in (option.choices or []))
+        type_part = f", type=click.Choice([{choices_str}])"
+    else:
+        type_part = _OPTION_TYPE_FRAGMENTS.get(option.type, "")
+
+    default_part = ""
+    if option.default is not None and option.type != "bool":
+        if isinstance(option.default, str):
+            default_part = f', default="{option.default}"'
+        else:
+            default_part = f", default={option.default}"
+
+    required_part = ", required=True" if option.required else ""
+
+    help_part = ""
+    if option.help:
+        # Escape quotes in help text
+        help_text = option.help.replace('"', '\\"')
+        help_part = f', help="{help_text}"'
+
+    return (
+        f'@click.option({short_part}"--{option.name}"'
+        f"{type_part}{default_part}{required_part}{help_part})"
+    )
+
+
+def _render_argument(arg: "ArgumentSpec") -> str:
+    """Render a @click.argument decorator for an argument."""
+    type_part = _ARGUMENT_TYPE_FRAGMENTS.get(arg.type, "")
+    # Arguments are required by default in Click
+    required_part = "" if arg.required else ", required=False"
+    return f'@click.argument("{arg.name}"{type_part}{required_part})'
+
+
+class _SpecModel(BaseModel):
+    """Base for the spec models: frozen, with derived values cached per instance."""
+
+    model_config = ConfigDict(
+        frozen=True, revalidate_instances="never", extra="forbid"
+    )
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        """Copy the model; cached properties are recomputed if fields change."""
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # cached_property values live in __dict__ beside the fields
+            for name in copy.__dict__.keys() - type(copy).model_fields.keys():
+                del copy.__dict__[name]
+        return copy
+
+
+class ArgumentSpec(_SpecModel):
     """A positional argument for a CLI command."""
 
     name: str = Field(..., description="Argument name (e.g., 'filename')")
@@ -28,12 +139,27 @@ class ArgumentSpec(BaseModel):
     @classmethod
     def clean_name(cls, v: str) -> str:
         """Clean up argument name by removing any leading dashes."""
-        if isinstance(v, str):
-            return sanitize_name(v)
-        return v
+        # Strip leading dashes ("--output" -> "output"); inner dashes are kept
+        return v.lstrip("-") if isinstance(v, str) else v
 
+    @field_validator("type", mode="before")
+    @classmethod
+    def intern_type(cls, v: str) -> str:
+        """Intern the type name so every spec shares one string per type."""
+        return sys.intern(v) if isinstance(v, str) else v
+
+    @classmethod
+    def construct_trusted(cls, **data: Any) -> "ArgumentSpec":
+        """Build an ArgumentSpec without validation (see CLISpec.construct_trusted)."""
+        return cls.model_construct(**data)
 
-class OptionSpec(BaseModel):
+    @cached_property
+    def click_decorator(self) -> str:
+        """The @click.argument decorator line, rendered once per argument."""
+        return _render_argument(self)
+
+
+class OptionSpec(_SpecModel):
     """A command-line option (flag)."""
 
     name: str = Field(..., description="Long option name (e.g., 'output')")
@@ -44,7 +170,7 @@ class OptionSpec(BaseModel):
     required: bool = Field(default=False, description="Whether option is required")
     default: Any = Field(default=None, description="Default value")
     help: str = Field(default="", description="Help text for the option")
-    choices: list[str] | None = Field(
+    choices: tuple[str, ...] | None = Field(
         default=None, description="Valid choices (for choice type)"
     )
 
@@ -52,9 +178,8 @@ class OptionSpec(BaseModel):
     @classmethod
     def clean_name(cls, v: str) -> str:
         """Clean up option name by removing any leading dashes."""
-        if isinstance(v, str):
-            return sanitize_name(v)
-        return v
+        # Strip leading dashes ("--output" -> "output"); inner dashes are kept
+        return v.lstrip("-") if isinstance(v, str) else v
 
     @field_validator("short", mode="before")
     @classmethod
@@ -65,18 +190,22 @@ class OptionSpec(BaseModel):
             return cleaned if cleaned else None
         return v
 
+    @field_validator("type", mode="before")
+    @classmethod
+    def intern_type(cls, v: str) -> str:
+        """Intern the type name so every spec shares one string per type."""
+        return sys.intern(v) if isinstance(v, str) else v
+
     @model_validator(mode="after")
-    def validate_short_option(self) -> "OptionSpec":
-        """Validate that short option is a single character."""
+    def validate_option(self) -> "OptionSpec":
+        """Validate the short name and, for choice options, the choices list."""
+        # Short option must be a single character
         if self.short is not None and len(self.short) != 1:
             raise ValueError(
                 f"Short option must be a single character, got '{self.short}'"
             )
-        return self
 
-    @model_validator(mode="after")
-    def validate_choice_type_has_choices(self) -> "OptionSpec":
-        """Validate that choice type options have a non-empty choices list."""
+        # Choice type options need a non-empty choices list
         if self.type == "choice":
             if self.choices is None or len(self.choices) == 0:
                 raise ValueError(
@@ -84,108 +213,164 @@ class OptionSpec(BaseModel):
                 )
         return self
 
+    @classmethod
+    def construct_trusted(cls, **data: Any) -> "OptionSpec":
+        """Build an OptionSpec without validation (see CLISpec.construct_trusted)."""
+        return cls.model_construct(**_freeze(data, "choices"))
+
+    @cached_property
+    def click_decorator(self) -> str:
+        """The @click.option decorator line, rendered once per option."""
+        return _render_option(self)
 
-class CommandSpec(BaseModel):
+
+@dataclass(frozen=True, slots=True)
+class CommandColumns:
+    """Column-wise (struct-of-arrays) view of a command's argument/option types."""
+
+    arg_types: tuple[str, ...]
+    opt_types: tuple[str, ...]
+
+
+class CommandSpec(_SpecModel):
     """A single command in the CLI."""
 
     name: str = Field(..., description="Command name (e.g., 'convert')")
     description: str = Field(..., description="Help text shown to users")
-    arguments: list[ArgumentSpec] = Field(
-        default_factory=list, description="Positional arguments"
+    arguments: tuple[ArgumentSpec, ...] = Field(
+        default=(), description="Positional arguments"
     )
-    options: list[OptionSpec] = Field(
-        default_factory=list, description="Command options"
+    options: tuple[OptionSpec, ...] = Field(
+        default=(), description="Command options"
     )
-    examples: list[str] = Field(
-        default_factory=list, description="Usage examples for help text"
+    examples: tuple[str, ...] = Field(
+        default=(), description="Usage examples for help text"
     )
 
     @model_validator(mode="after")
     def validate_no_duplicates(self) -> "CommandSpec":
         """Validate no duplicate option names, short names, or argument names."""
-        # Check for duplicate option names
-        option_names = [opt.name for opt in self.options]
-        if len(option_names) != len(set(option_names)):
-            seen = set()
-            duplicates = [n for n in option_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate option names: {duplicates}")
-
-        # Check for duplicate short option names (excluding None)
-        short_names = [opt.short for opt in self.options if opt.short is not None]
-        if len(short_names) != len(set(short_names)):
-            seen = set()
-            duplicates = [n for n in short_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate short option names: {duplicates}")
-
-        # Check for duplicate argument names
-        arg_names = [arg.name for arg in self.arguments]
-        if len(arg_names) != len(set(arg_names)):
-            seen = set()
-            duplicates = [n for n in arg_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate argument names: {duplicates}")
+        _check_unique(self.options, _NAME, "option names")
+        _check_unique(self.options, _SHORT, "short option names")
+        _check_unique(self.arguments, _NAME, "argument names")
 
         return self
 
-
-# Pattern for valid Python identifiers (package names)
-PYTHON_IDENTIFIER_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-
-
-class CLISpec(BaseModel):
+    @classmethod
+    def construct_trusted(cls, **data: Any) -> "CommandSpec":
+        """Build a CommandSpec without validation (see CLISpec.construct_trusted).
+
+        Nested arguments and options may be given as dicts or model instances.
+        """
+        if "arguments" in data:
+            data["arguments"] = _construct_all(ArgumentSpec, data["arguments"])
+        if "options" in data:
+            data["options"] = _construct_all(OptionSpec, data["options"])
+        return cls.model_construct(**_freeze(data, "examples"))
+
+    @cached_property
+    def columns(self) -> CommandColumns:
+        """Parallel tuples of argument/option types, built on first access."""
+        return CommandColumns(
+            arg_types=tuple(arg.type for arg in self.arguments),
+            opt_types=tuple(opt.type for opt in self.options),
+        )
+
+
+_KEYWORDS: frozenset[str] = frozenset(keyword.kwlist)
+
+
+@lru_cache(maxsize=256)
+def _validate_cli_name(name: str) -> None:
+    """Check that a CLI name is usable as a Python package name.
+
+    Results are memoized per name; a failure is not cached, so invalid names
+    re-raise on every call.
+
+    Raises:
+        ValueError: If the name is empty, not an identifier, or a keyword
+    """
+    if not name:
+        raise ValueError("CLI name cannot be empty")
+
+    # ASCII-only identifier: starts with a letter/underscore, then [A-Za-z0-9_]
+    if not (name.isascii() and name.isidentifier()):
+        raise ValueError(
+            f"'{name}' is not a valid Python package name. "
+            "Must start with a letter or underscore, contain only "
+            "letters, numbers, and underscores."
+        )
+
+    if name in _KEYWORDS:
+        raise ValueError(
+            f"'{name}' is not a valid Python package name. "
+            "Cannot use Python keywords."
+        )
+
+
+class CLISpec(_SpecModel):
     """The complete specification for a CLI to generate."""
 
     name: str = Field(..., description="CLI name (e.g., 'imgconvert')")
     description: str = Field(..., description="What the CLI does")
-    commands: list[CommandSpec] = Field(
-        default_factory=list, description="Commands to generate"
+    commands: tuple[CommandSpec, ...] = Field(
+        default=(), description="Commands to generate"
     )
-    global_options: list[OptionSpec] = Field(
-        default_factory=list, description="Options available to all commands"
+    global_options: tuple[OptionSpec, ...] = Field(
+        default=(), description="Options available to all commands"
     )
     python_version: str = Field(default="3.11", description="Target Python version")
-    dependencies: list[str] = Field(
-        default_factory=list, description="Required pip packages"
+    dependencies: tuple[str, ...] = Field(
+        default=(), description="Required pip packages"
     )
 
+    def __hash__(self) -> int:
+        """Hash the identifying string fields, so equal specs hash equally.
+
+        Nested option defaults may be unhashable or not JSON-serializable, so
+        they are left to ``__eq__``; the hash only has to be cheap and total.
+        """
+        # The generated frozen-model hash fails on unhashable option defaults
+        return hash(
+            (
+                self.name,
+                self.description,
+                self.python_version,
+                tuple(cmd.name for cmd in self.commands),
+                tuple(opt.name for opt in self.global_options),
+            )
+        )
+
     @model_validator(mode="after")
     def validate_cli_spec(self) -> "CLISpec":
         """Validate CLI name is valid package name and no duplicate commands."""
         # Validate CLI name is a valid Python package name
-        if not self.name:
-            raise ValueError("CLI name cannot be empty")
-
-        if not PYTHON_IDENTIFIER_PATTERN.match(self.name):
-            raise ValueError(
-                f"'{self.name}' is not a valid Python package name. "
-                "Must start with a letter or underscore, contain only "
-                "letters, numbers, and underscores."
-            )
-
-        if keyword.iskeyword(self.name):
-            raise ValueError(
-                f"'{self.name}' is not a valid Python package name. "
-                "Cannot use Python keywords."
-            )
+        _validate_cli_name(self.name)
 
-        # Check for duplicate command names
-        command_names = [cmd.name for cmd in self.commands]
-        if len(command_names) != len(set(command_names)):
-            seen = set()
-            duplicates = [n for n in command_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate command names: {duplicates}")
-
-        # Check for duplicate global option names
-        option_names = [opt.name for opt in self.global_options]
-        if len(option_names) != len(set(option_names)):
-            seen = set()
-            duplicates = [n for n in option_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate global option names: {duplicates}")
-
-        # Check for duplicate global short option names
-        short_names = [opt.short for opt in self.global_options if opt.short is not None]
-        if len(short_names) != len(set(short_names)):
-            seen = set()
-            duplicates = [n for n in short_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
-            raise ValueError(f"Duplicate global short option names: {duplicates}")
+        # Check for duplicate command and global option names
+        _check_unique(self.commands, _NAME, "command names")
+        _check_unique(self.global_options, _NAME, "global option names")
+        _check_unique(self.global_options, _SHORT, "global short option names")
 
         return self
+
+    @classmethod
+    def construct_trusted(cls, **data: Any) -> "CLISpec":
+        """Build a CLISpec without running any validators.
+
+        Unlike model_construct, nested commands and options given as dicts
+        are constructed as models too. Only use this for data authored in
+        this repo or written by cli-gen itself; LLM output and hand-edited
+        spec files must go through model_validate.
+
+        Args:
+            **data: Field values, as accepted by the CLISpec constructor
+
+        Returns:
+            The unvalidated CLISpec
+        """
+        if "commands" in data:
+            data["commands"] = _construct_all(CommandSpec, data["commands"])
+        if "global_options" in data:
+            data["global_options"] = _construct_all(OptionSpec, data["global_options"])
+        return cls.model_construct(**_freeze(data, "dependencies"))
@@ -0,0 +1,33 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from click.testing import CliRunner
+
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.generators.spec_generator import SpecGenerator
+
+
+@pytest.fixture(scope="session")
+def spec_generator() -> SpecGenerator:
+    """Create one SpecGenerator for the whole test session.
+
+    Tests swap the model with ``agent.override(...)``, which is scoped to the
+    ``with`` block, so sharing the instance does not leak state between tests.
+    """
+    return SpecGenerator()
+
+
+@pytest.fixture(scope="session")
+def code_generator() -> CodeGenerator:
+    """Create one CodeGenerator for the whole test session."""
+    return CodeGenerator()
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """Create one CLI test runner for the whole test session.
+
+    CliRunner.invoke sets up fresh, isolated streams and environment on every
+    call, so the runner itself holds no per-test state.
+    """
+    return CliRunner()
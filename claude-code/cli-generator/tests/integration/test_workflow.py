@@ -7,14 +7,17 @@ These tests verify the full pipeline:
 4. Optionally install and test --help (slow tests)
 """
 
-import ast
+import json
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
+from pydantic import TypeAdapter
 from pydantic_ai.models.test import TestModel
 
 from cli_generator.generators.code_generator import CodeGenerator
@@ -26,20 +29,28 @@ from cli_generator.models import (
     OptionSpec,
 )
 
+# Built once so batches of commands validate in a single call
+_CMD_LIST_ADAPTER = TypeAdapter(list[CommandSpec])
+
+# Runs several invocations of an installed CLI in one interpreter and prints
+# {key: [exit_code, output]} as JSON, saving a Python startup per invocation
+_INVOKE_SCRIPT = """
+import json
+from click.testing import CliRunner
+from {package}.cli import cli
+
+runner = CliRunner()
+results = {{}}
+for key, args in {invocations!r}.items():
+    result = runner.invoke(cli, args)
+    results[key] = [result.exit_code, result.output]
+print(json.dumps(results))
+"""
+
 
 class TestWorkflowWithMockedLLM:
     """Integration tests using mocked LLM responses for fast execution."""
 
-    @pytest.fixture
-    def spec_generator(self) -> SpecGenerator:
-        """Create a SpecGenerator instance."""
-        return SpecGenerator()
-
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
     async def test_full_workflow_mocked(
         self, spec_generator: SpecGenerator, code_generator: CodeGenerator
     ) -> None:
@@ -68,12 +79,12 @@ class TestWorkflowWithMockedLLM:
                 assert file_path.exists(), f"{file_path} should exist"
 
             # Step 4: Verify generated Python code compiles
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)  # Raises SyntaxError if invalid
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")  # Raises SyntaxError if invalid
 
             # Verify init.py compiles
-            init_code = result["init"].read_text()
-            ast.parse(init_code)
+            init_code = result["init"].text
+            compile(init_code, "<init>", "exec")
 
     async def test_workflow_with_complex_cli(
         self, spec_generator: SpecGenerator, code_generator: CodeGenerator
@@ -91,8 +102,8 @@ class TestWorkflowWithMockedLLM:
             result = code_generator.generate(spec, Path(tmpdir))
 
             # Verify code compiles
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
     async def test_workflow_add_command_to_existing(
         self, spec_generator: SpecGenerator, code_generator: CodeGenerator
@@ -120,30 +131,25 @@ class TestWorkflowWithMockedLLM:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(updated_spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
 
 class TestWorkflowWithFixedSpec:
     """Integration tests using a pre-defined spec to test code generation reliability."""
 
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
     @pytest.fixture
     def realistic_spec(self) -> CLISpec:
         """Create a realistic CLISpec for thorough testing."""
-        return CLISpec(
+        return CLISpec.construct_trusted(
             name="imgconvert",
             description="Convert images between formats",
             commands=[
-                CommandSpec(
+                CommandSpec.construct_trusted(
                     name="convert",
                     description="Convert an image to a different format",
                     arguments=[
-                        ArgumentSpec(
+                        ArgumentSpec.construct_trusted(
                             name="input_file",
                             type="path",
                             required=True,
@@ -151,14 +157,14 @@ class TestWorkflowWithFixedSpec:
                         ),
                     ],
                     options=[
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
                             name="output",
                             short="o",
                             type="path",
                             required=False,
                             help="Output file path",
                         ),
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
                             name="format",
                             short="f",
                             type="choice",
@@ -166,7 +172,7 @@ class TestWorkflowWithFixedSpec:
                             default="png",
                             help="Output format",
                         ),
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
                             name="quality",
                             short="q",
                             type="int",
@@ -179,11 +185,11 @@ class TestWorkflowWithFixedSpec:
                         "imgconvert convert photo.jpg -o output.png -q 90",
                     ],
                 ),
-                CommandSpec(
+                CommandSpec.construct_trusted(
                     name="info",
                     description="Display information about an image",
                     arguments=[
-                        ArgumentSpec(
+                        ArgumentSpec.construct_trusted(
                             name="file",
                             type="path",
                             required=True,
@@ -191,7 +197,7 @@ class TestWorkflowWithFixedSpec:
                         ),
                     ],
                     options=[
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
                             name="verbose",
                             short="v",
                             type="bool",
@@ -201,7 +207,7 @@ class TestWorkflowWithFixedSpec:
                 ),
             ],
             global_options=[
-                OptionSpec(
+                OptionSpec.construct_trusted(
                     name="quiet",
                     short="q",
                     type="bool",
@@ -220,8 +226,8 @@ class TestWorkflowWithFixedSpec:
             result = code_generator.generate(realistic_spec, Path(tmpdir))
 
             # Verify cli.py compiles and has expected content
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
             # Verify expected commands are present
             assert "def convert(" in cli_code
@@ -233,7 +239,7 @@ class TestWorkflowWithFixedSpec:
             assert "click.Choice" in cli_code  # For format option
 
             # Verify pyproject has dependencies
-            pyproject = result["pyproject"].read_text()
+            pyproject = result["pyproject"].text
             assert "pillow" in pyproject
             assert "click" in pyproject
 
@@ -264,11 +270,6 @@ class TestWorkflowWithRealLLM:
         """Create a SpecGenerator with real model."""
         return SpecGenerator(model="openai:gpt-4o-mini")
 
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
     @pytest.mark.skipif(
         not os.environ.get("OPENAI_API_KEY"),
         reason="OPENAI_API_KEY not set",
@@ -293,8 +294,8 @@ class TestWorkflowWithRealLLM:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
     @pytest.mark.skipif(
         not os.environ.get("OPENAI_API_KEY"),
@@ -317,34 +318,34 @@ class TestWorkflowWithRealLLM:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
 
 @pytest.mark.slow
+# Keep both tests on one xdist worker so the class-scoped install runs once
+@pytest.mark.xdist_group("install")
 class TestWorkflowInstallAndRun:
     """Integration tests that actually install and run the generated CLI."""
 
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
-    @pytest.fixture
-    def simple_spec(self) -> CLISpec:
+    @pytest.fixture(scope="class")
+    @classmethod
+    def simple_spec(cls) -> CLISpec:
         """Create a simple, minimal spec for installation testing."""
-        return CLISpec(
+        return CLISpec.construct_trusted(
             name="testcli",
             description="A simple test CLI",
             commands=[
-                CommandSpec(
+                CommandSpec.construct_trusted(
                     name="hello",
                     description="Print a greeting",
                     arguments=[
-                        ArgumentSpec(name="name", type="str", help="Name to greet"),
+                        ArgumentSpec.construct_trusted(
+                            name="name", type="str", help="Name to greet"
+                        ),
                     ],
                     options=[
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
                             name="loud",
                             short="l",
                             type="bool",
@@ -355,32 +356,42 @@ class TestWorkflowInstallAndRun:
             ],
         )
 
-    def test_generated_cli_installs_and_shows_help(
-        self, code_generator: CodeGenerator, simple_spec: CLISpec
-    ) -> None:
-        """Test that generated CLI can be installed and shows --help."""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def installed_cli(
+        cls, code_generator: CodeGenerator, simple_spec: CLISpec
+    ) -> Iterator[Path]:
+        """Generate and install the CLI into a venv once for the whole class.
+
+        Yields:
+            Path to the venv's Python interpreter
+        """
         with tempfile.TemporaryDirectory() as tmpdir:
-            result = code_generator.generate(simple_spec, Path(tmpdir))
+            code_generator.generate(simple_spec, Path(tmpdir))
 
-            # Create a virtual environment and install
+            # Create a virtual environment and install. uv is much faster
+            # than venv + pip; fall back to the stdlib when it isn't on PATH.
             venv_dir = Path(tmpdir) / ".venv"
-            subprocess.run(
-                [sys.executable, "-m", "venv", str(venv_dir)],
-                check=True,
-                capture_output=True,
-            )
+            uv = shutil.which("uv")
+            if uv:
+                venv_cmd = [uv, "venv", "--quiet", str(venv_dir)]
+            else:
+                venv_cmd = [sys.executable, "-m", "venv", str(venv_dir)]
+            subprocess.run(venv_cmd, check=True, capture_output=True)
 
-            # Get the pip path in the venv
+            # Get the interpreter path in the venv
             if sys.platform == "win32":
-                pip_path = venv_dir / "Scripts" / "pip"
                 python_path = venv_dir / "Scripts" / "python"
             else:
-                pip_path = venv_dir / "bin" / "pip"
                 python_path = venv_dir / "bin" / "python"
 
             # Install the generated package
+            if uv:
+                install_cmd = [uv, "pip", "install", "--python", str(python_path)]
+            else:
+                install_cmd = [str(python_path), "-m", "pip", "install"]
             install_result = subprocess.run(
-                [str(pip_path), "install", "-e", str(tmpdir)],
+                [*install_cmd, "-e", str(tmpdir)],
                 capture_output=True,
                 text=True,
             )
@@ -390,78 +401,63 @@ class TestWorkflowInstallAndRun:
                     f"Failed to install generated CLI: {install_result.stderr}"
                 )
 
-            # Test --help on main CLI
-            help_result = subprocess.run(
-                [str(python_path), "-m", simple_spec.name + ".cli", "--help"],
-                capture_output=True,
-                text=True,
-            )
-
-            assert help_result.returncode == 0
-            assert simple_spec.description in help_result.stdout or "--help" in help_result.stdout
+            yield python_path
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def cli_outputs(
+        cls, installed_cli: Path, simple_spec: CLISpec
+    ) -> dict[str, tuple[int, str]]:
+        """Run every invocation the tests check in a single subprocess.
+
+        Returns:
+            Dict mapping invocation name to (exit code, output)
+        """
+        invocations = {
+            "help": ["--help"],
+            "command_help": ["hello", "--help"],
+            "version": ["--version"],
+        }
+        script = _INVOKE_SCRIPT.format(
+            package=simple_spec.name, invocations=invocations
+        )
+        result = subprocess.run(
+            [str(installed_cli), "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return {
+            key: (exit_code, output)
+            for key, (exit_code, output) in json.loads(result.stdout).items()
+        }
 
-            # Test --help on subcommand
-            cmd_help_result = subprocess.run(
-                [str(python_path), "-m", simple_spec.name + ".cli", "hello", "--help"],
-                capture_output=True,
-                text=True,
-            )
+    def test_generated_cli_installs_and_shows_help(
+        self, cli_outputs: dict[str, tuple[int, str]], simple_spec: CLISpec
+    ) -> None:
+        """Test that generated CLI can be installed and shows --help."""
+        # Test --help on main CLI
+        exit_code, output = cli_outputs["help"]
+        assert exit_code == 0
+        assert simple_spec.description in output or "--help" in output
 
-            assert cmd_help_result.returncode == 0
-            assert "name" in cmd_help_result.stdout.lower() or "NAME" in cmd_help_result.stdout
+        # Test --help on subcommand
+        exit_code, output = cli_outputs["command_help"]
+        assert exit_code == 0
+        assert "name" in output.lower() or "NAME" in output
 
     def test_generated_cli_version_flag(
-        self, code_generator: CodeGenerator, simple_spec: CLISpec
+        self, cli_outputs: dict[str, tuple[int, str]]
     ) -> None:
         """Test that generated CLI has working --version flag."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = code_generator.generate(simple_spec, Path(tmpdir))
-
-            venv_dir = Path(tmpdir) / ".venv"
-            subprocess.run(
-                [sys.executable, "-m", "venv", str(venv_dir)],
-                check=True,
-                capture_output=True,
-            )
-
-            if sys.platform == "win32":
-                pip_path = venv_dir / "Scripts" / "pip"
-                python_path = venv_dir / "Scripts" / "python"
-            else:
-                pip_path = venv_dir / "bin" / "pip"
-                python_path = venv_dir / "bin" / "python"
-
-            subprocess.run(
-                [str(pip_path), "install", "-e", str(tmpdir)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            # Test --version
-            version_result = subprocess.run(
-                [str(python_path), "-m", simple_spec.name + ".cli", "--version"],
-                capture_output=True,
-                text=True,
-            )
-
-            assert version_result.returncode == 0
-            assert "0.1.0" in version_result.stdout
+        exit_code, output = cli_outputs["version"]
+        assert exit_code == 0
+        assert "0.1.0" in output
 
 
 class TestWorkflowErrorHandling:
     """Tests for error handling in the workflow."""
 
-    @pytest.fixture
-    def spec_generator(self) -> SpecGenerator:
-        """Create a SpecGenerator instance."""
-        return SpecGenerator()
-
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
     async def test_empty_description_raises_error(
         self, spec_generator: SpecGenerator
     ) -> None:
@@ -494,11 +490,6 @@ class TestWorkflowErrorHandling:
 class TestWorkflowEdgeCases:
     """Tests for edge cases in the workflow."""
 
-    @pytest.fixture
-    def code_generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
     def test_spec_with_no_commands(self, code_generator: CodeGenerator) -> None:
         """Test generating CLI with no subcommands (single-purpose CLI)."""
         spec = CLISpec(
@@ -512,8 +503,8 @@ class TestWorkflowEdgeCases:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
     def test_spec_with_special_characters_in_description(
         self, code_generator: CodeGenerator
@@ -533,17 +524,16 @@ class TestWorkflowEdgeCases:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
     def test_spec_with_many_commands(self, code_generator: CodeGenerator) -> None:
         """Test generating CLI with many commands."""
-        commands = [
-            CommandSpec(name=f"cmd{i}", description=f"Command number {i}")
-            for i in range(10)
-        ]
+        commands = _CMD_LIST_ADAPTER.validate_python(
+            [{"name": f"cmd{i}", "description": f"Command number {i}"} for i in range(10)]
+        )
 
-        spec = CLISpec(
+        spec = CLISpec.construct_trusted(
             name="manycmds",
             description="A tool with many commands",
             commands=commands,
@@ -552,8 +542,8 @@ class TestWorkflowEdgeCases:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
             # All commands should be in the code
             for i in range(10):
@@ -561,20 +551,30 @@ class TestWorkflowEdgeCases:
 
     def test_spec_with_all_option_types(self, code_generator: CodeGenerator) -> None:
         """Test generating CLI with all supported option types."""
-        spec = CLISpec(
+        spec = CLISpec.construct_trusted(
             name="alltypes",
             description="CLI with all option types",
             commands=[
-                CommandSpec(
+                CommandSpec.construct_trusted(
                     name="demo",
                     description="Demonstrate all types",
                     options=[
-                        OptionSpec(name="text", type="str", help="String option"),
-                        OptionSpec(name="number", type="int", help="Integer option"),
-                        OptionSpec(name="rate", type="float", help="Float option"),
-                        OptionSpec(name="flag", type="bool", help="Boolean flag"),
-                        OptionSpec(name="file", type="path", help="Path option"),
-                        OptionSpec(
+                        OptionSpec.construct_trusted(
+                            name="text", type="str", help="String option"
+                        ),
+                        OptionSpec.construct_trusted(
+                            name="number", type="int", help="Integer option"
+                        ),
+                        OptionSpec.construct_trusted(
+                            name="rate", type="float", help="Float option"
+                        ),
+                        OptionSpec.construct_trusted(
+                            name="flag", type="bool", help="Boolean flag"
+                        ),
+                        OptionSpec.construct_trusted(
+                            name="file", type="path", help="Path option"
+                        ),
+                        OptionSpec.construct_trusted(
                             name="choice",
                             type="choice",
                             choices=["a", "b", "c"],
@@ -588,8 +588,8 @@ class TestWorkflowEdgeCases:
         with tempfile.TemporaryDirectory() as tmpdir:
             result = code_generator.generate(spec, Path(tmpdir))
 
-            cli_code = result["cli"].read_text()
-            ast.parse(cli_code)
+            cli_code = result["cli"].text
+            compile(cli_code, "<cli>", "exec")
 
             # Verify type handling
             assert "type=int" in cli_code
@@ -0,0 +1,108 @@
+"""Unit tests for the spec caches."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from cli_generator.cache import LocalSpecCache, SpecCache, spec_cache_key
+from cli_generator.models import CLISpec, CommandSpec
+
+
+class TestSpecCacheKey:
+    """Tests for spec_cache_key()."""
+
+    def test_key_ignores_case_and_surrounding_whitespace(self) -> None:
+        """Normalized descriptions should share a key."""
+        assert spec_cache_key("m", "  A Word Counter\n") == spec_cache_key(
+            "m", "a word counter"
+        )
+
+    def test_key_depends_on_model(self) -> None:
+        """Different models should not share cache entries."""
+        assert spec_cache_key("a", "counter") != spec_cache_key("b", "counter")
+
+
+class TestSpecCache:
+    """Tests for SpecCache get/put."""
+
+    @pytest.fixture
+    def spec(self) -> CLISpec:
+        """Create a spec to store in the cache."""
+        return CLISpec(
+            name="counter",
+            description="Count things",
+            commands=[CommandSpec(name="count", description="Count")],
+        )
+
+    def test_miss_returns_none(self, tmp_path: Path) -> None:
+        """Unknown descriptions should miss."""
+        cache = SpecCache(tmp_path / "specs.db")
+        assert cache.get("m", "A counter") is None
+        cache.close()
+
+    def test_put_then_get_round_trips(self, spec: CLISpec, tmp_path: Path) -> None:
+        """A stored spec should be returned for the same description."""
+        cache = SpecCache(tmp_path / "specs.db")
+        cache.put("m", "A counter", spec)
+
+        assert cache.get("m", "a counter ") == spec
+        cache.close()
+
+    def test_entries_persist_across_instances(
+        self, spec: CLISpec, tmp_path: Path
+    ) -> None:
+        """The cache should be persistent on disk."""
+        db_path = tmp_path / "specs.db"
+        cache = SpecCache(db_path)
+        cache.put("m", "A counter", spec)
+        cache.close()
+
+        reopened = SpecCache(db_path)
+        assert reopened.get("m", "A counter") == spec
+        reopened.close()
+
+    def test_delete_removes_entry(self, spec: CLISpec, tmp_path: Path) -> None:
+        """Deleted entries should miss."""
+        cache = SpecCache(tmp_path / "specs.db")
+        cache.put("m", "A counter", spec)
+        cache.delete("m", "A counter")
+
+        assert cache.get("m", "A counter") is None
+        cache.close()
+
+    def test_context_manager_closes_connection(self, tmp_path: Path) -> None:
+        """Leaving a with block should close the database connection."""
+        with SpecCache(tmp_path / "specs.db") as cache:
+            assert cache.get("m", "A counter") is None
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            cache.get("m", "A counter")
+
+
+class TestLocalSpecCache:
+    """Tests for the per-output-directory LocalSpecCache."""
+
+    @pytest.fixture
+    def spec(self) -> CLISpec:
+        """Create a spec to store in the cache."""
+        return CLISpec(name="counter", description="Count things")
+
+    def test_put_then_get_round_trips(self, spec: CLISpec, tmp_path: Path) -> None:
+        """A stored spec should be returned for the same description."""
+        cache = LocalSpecCache(tmp_path)
+        assert cache.get("m", "A counter") is None
+
+        cache.put("m", "A counter", spec)
+
+        assert cache.get("m", "A counter") == spec
+        assert (tmp_path / ".cli-gen-cache").is_dir()
+
+    def test_corrupt_entry_is_a_miss(self, spec: CLISpec, tmp_path: Path) -> None:
+        """Unreadable cache files should be ignored, not raised."""
+        cache = LocalSpecCache(tmp_path)
+        cache.put("m", "A counter", spec)
+        for path in cache.directory.iterdir():
+            path.write_text("not json")
+
+        assert cache.get("m", "A counter") is None
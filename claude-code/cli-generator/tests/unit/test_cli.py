@@ -1,25 +1,43 @@
 """Unit tests for CLI interface."""
 
-import json
-import tempfile
+import asyncio
+import atexit
+import re
+import subprocess
+import sys
 from pathlib import Path
 
+import click
 import pytest
-from click.testing import CliRunner
-from pydantic_ai.models.test import TestModel
+from click.testing import CliRunner, Result
+from pydantic import TypeAdapter
 
-from cli_generator.cli import cli, spec_cmd, generate_cmd, build_cmd
+from cli_generator import cli as cli_module
+from cli_generator.cli import cli
+from cli_generator.generators.code_generator import CodeGenerator
 from cli_generator.models import CLISpec, CommandSpec
 
+# Either wording is accepted in error output, matched with one search
+_INVALID_RE = re.compile(r"error|invalid", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(r"error|not found", re.IGNORECASE)
+
+# Built once and reused for every spec file the tests write
+_SPEC_ADAPTER = TypeAdapter(CLISpec)
+
+SAMPLE_SPEC = CLISpec(
+    name="testcli",
+    description="A test CLI",
+    commands=[
+        CommandSpec(name="hello", description="Say hello"),
+    ],
+)
+# Fed to ``build -`` on stdin, so most build tests never touch a spec file
+SAMPLE_SPEC_JSON = _SPEC_ADAPTER.dump_json(SAMPLE_SPEC)
+
 
 class TestCLIGroup:
     """Tests for the main CLI group."""
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create a CLI test runner."""
-        return CliRunner()
-
     def test_cli_has_help(self, runner: CliRunner) -> None:
         """CLI should have help text."""
         result = runner.invoke(cli, ["--help"])
@@ -36,22 +54,53 @@ class TestCLIGroup:
 class TestSpecCommand:
     """Tests for the 'spec' command."""
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create a CLI test runner."""
-        return CliRunner()
-
     def test_spec_requires_description(self, runner: CliRunner) -> None:
         """spec command should require a description."""
-        result = runner.invoke(cli, ["spec"])
-        assert result.exit_code != 0
-        assert "Missing argument" in result.output or "required" in result.output.lower()
+        result = runner.invoke(cli, ["spec"], standalone_mode=False)
+        assert isinstance(result.exception, click.UsageError)
 
-    def test_spec_has_help(self, runner: CliRunner) -> None:
-        """spec command should have help text."""
-        result = runner.invoke(cli, ["spec", "--help"])
-        assert result.exit_code == 0
-        assert "description" in result.output.lower()
+    def test_spec_works_without_writable_cache(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """An unusable spec cache should be skipped with a warning, not fail."""
+        # A regular file where the cache directory should go
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        result = runner.invoke(
+            cli,
+            ["spec", "A counter tool", "--model", "test"],
+            env={"XDG_CACHE_HOME": str(blocker)},
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Spec cache unavailable" in result.stderr
+        assert CLISpec.model_validate_json(result.stdout).name
+
+    def test_spec_rejects_description_with_batch(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """spec should not silently ignore DESCRIPTION when --batch is given."""
+        batch_file = tmp_path / "descriptions.txt"
+        batch_file.write_text("A counter CLI\n")
+        result = runner.invoke(
+            cli,
+            ["spec", "A timer CLI", "--batch", str(batch_file), "--test-mode"],
+            standalone_mode=False,
+        )
+        assert isinstance(result.exception, click.UsageError)
+        assert "--batch" in str(result.exception)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def spec_help(cls, runner: CliRunner) -> Result:
+        """Invoke ``spec --help`` once for every help check in the class."""
+        return runner.invoke(cli, ["spec", "--help"])
+
+    @pytest.mark.parametrize("needle", ["description", "--save", "--batch"])
+    def test_spec_help_contains(self, spec_help: Result, needle: str) -> None:
+        """spec command help should describe its argument and options."""
+        assert spec_help.exit_code == 0
+        assert needle in spec_help.output.lower()
 
     def test_spec_outputs_json(self, runner: CliRunner) -> None:
         """spec command should output JSON."""
@@ -65,154 +114,326 @@ class TestSpecCommand:
         # With test mode, it should produce valid output
         assert result.exit_code == 0 or "Error" in result.output
 
-    def test_spec_with_save_option(self, runner: CliRunner) -> None:
+    def test_spec_prints_plain_json_when_piped(self, runner: CliRunner) -> None:
+        """Non-terminal output should be raw JSON without Rich panel borders."""
+        result = runner.invoke(cli, ["spec", "A simple counter CLI", "--test-mode"])
+        assert result.exit_code == 0
+        assert '"name":' in result.output
+        assert "CLI Specification" not in result.output
+        # Progress and summary go to stderr, leaving stdout parseable
+        assert CLISpec.model_validate_json(result.stdout).name
+
+    def test_spec_with_save_option(self, runner: CliRunner, tmp_path: Path) -> None:
         """spec command should support --save option."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            spec_file = Path(tmpdir) / "spec.json"
-            result = runner.invoke(
-                cli,
-                ["spec", "A counter CLI", "--save", str(spec_file), "--test-mode"],
-            )
-            # Either succeeds or shows error message
-            if result.exit_code == 0:
-                assert spec_file.exists()
+        spec_file = tmp_path / "spec.json"
+        result = runner.invoke(
+            cli,
+            ["spec", "A counter CLI", "--save", str(spec_file), "--test-mode"],
+        )
+        # Either succeeds or shows error message
+        if result.exit_code == 0:
+            assert spec_file.exists()
+
+    def test_spec_batch_saves_each_spec(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """spec --batch should generate and save a spec per description."""
+        batch_file = tmp_path / "descriptions.txt"
+        # TestModel names every spec "a", so the saved names collide
+        batch_file.write_text("A counter CLI\n\nA timer CLI\n")
+        save_dir = tmp_path / "specs"
+        result = runner.invoke(
+            cli,
+            [
+                "spec",
+                "--batch",
+                str(batch_file),
+                "--save",
+                str(save_dir),
+                "--test-mode",
+            ],
+        )
+        assert result.exit_code == 0
+        assert sorted(path.name for path in save_dir.glob("*.json")) == [
+            "a.json",
+            "a_2.json",
+        ]
 
 
 class TestGenerateCommand:
     """Tests for the 'generate' command."""
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create a CLI test runner."""
-        return CliRunner()
-
     def test_generate_requires_description(self, runner: CliRunner) -> None:
         """generate command should require a description."""
-        result = runner.invoke(cli, ["generate"])
-        assert result.exit_code != 0
-
-    def test_generate_has_help(self, runner: CliRunner) -> None:
-        """generate command should have help text."""
-        result = runner.invoke(cli, ["generate", "--help"])
-        assert result.exit_code == 0
-        assert "output" in result.output.lower()
-
-    def test_generate_has_output_option(self, runner: CliRunner) -> None:
-        """generate command should have --output option."""
-        result = runner.invoke(cli, ["generate", "--help"])
-        assert result.exit_code == 0
-        assert "--output" in result.output or "-o" in result.output
+        result = runner.invoke(cli, ["generate"], standalone_mode=False)
+        assert isinstance(result.exception, click.UsageError)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def generate_help(cls, runner: CliRunner) -> Result:
+        """Invoke ``generate --help`` once for every help check in the class."""
+        return runner.invoke(cli, ["generate", "--help"])
+
+    @pytest.mark.parametrize("needle", ["output", "--output", "--dry-run"])
+    def test_generate_help_contains(self, generate_help: Result, needle: str) -> None:
+        """generate command help should list its options."""
+        assert generate_help.exit_code == 0
+        assert needle in generate_help.output
+
+    def test_generate_dry_run_does_not_create_files(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """generate --dry-run should not create files."""
+        result = runner.invoke(
+            cli,
+            [
+                "generate",
+                "A counter CLI",
+                "--output",
+                str(tmp_path),
+                "--dry-run",
+                "--test-mode",
+            ],
+        )
+        # In dry-run mode, we shouldn't create the package
+        if result.exit_code == 0:
+            assert not any(tmp_path.rglob("cli.py"))
 
-    def test_generate_has_dry_run_option(self, runner: CliRunner) -> None:
-        """generate command should have --dry-run option."""
-        result = runner.invoke(cli, ["generate", "--help"])
-        assert result.exit_code == 0
-        assert "--dry-run" in result.output
+    def test_generate_reuses_spec_cached_in_output_dir(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """A second generate into the same directory should reuse the spec."""
+        args = ["generate", "A counter CLI", "--output", str(tmp_path), "--test-mode"]
+        first = runner.invoke(cli, args)
+        second = runner.invoke(cli, args)
+        refreshed = runner.invoke(cli, [*args, "--refresh"])
 
-    def test_generate_dry_run_does_not_create_files(self, runner: CliRunner) -> None:
-        """generate --dry-run should not create files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = runner.invoke(
-                cli,
-                [
-                    "generate",
-                    "A counter CLI",
-                    "--output",
-                    tmpdir,
-                    "--dry-run",
-                    "--test-mode",
-                ],
-            )
-            # Check that no new directories were created
-            # (tmpdir will exist but should be empty or have no package dir)
-            if result.exit_code == 0:
-                # In dry-run mode, we shouldn't create the package
-                contents = list(Path(tmpdir).iterdir())
-                # Either empty or only contains the spec output, not a full package
-                assert len(contents) == 0 or not any(
-                    (Path(tmpdir) / d / "cli.py").exists() for d in contents
-                )
+        assert first.exit_code == 0
+        assert "Using cached specification" not in first.output
+        assert "Using cached specification" in second.output
+        assert "Using cached specification" not in refreshed.output
 
 
 class TestBuildCommand:
     """Tests for the 'build' command."""
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create a CLI test runner."""
-        return CliRunner()
+    @pytest.fixture(scope="session")
+    @classmethod
+    def sample_spec_file(cls, tmp_path_factory: pytest.TempPathFactory) -> Path:
+        """Create a sample spec file, written once and shared by the session."""
+        spec_file = tmp_path_factory.mktemp("spec") / "spec.json"
+        spec_file.write_bytes(_SPEC_ADAPTER.dump_json(SAMPLE_SPEC, indent=2))
+        return spec_file
 
     @pytest.fixture
-    def sample_spec_file(self) -> Path:
-        """Create a sample spec file for testing."""
-        spec = CLISpec(
-            name="testcli",
-            description="A test CLI",
-            commands=[
-                CommandSpec(name="hello", description="Say hello"),
-            ],
-        )
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            f.write(spec.model_dump_json(indent=2))
-            return Path(f.name)
+    def generate_calls(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> list[tuple[CLISpec, Path]]:
+        """Replace CodeGenerator.generate with a stub that records its calls."""
+        calls: list[tuple[CLISpec, Path]] = []
+
+        def record(
+            self: CodeGenerator, spec: CLISpec, output_dir: Path
+        ) -> dict[str, Path]:
+            calls.append((spec, output_dir))
+            return {}
+
+        monkeypatch.setattr(CodeGenerator, "generate", record)
+        return calls
 
     def test_build_requires_spec_file(self, runner: CliRunner) -> None:
         """build command should require a spec file."""
-        result = runner.invoke(cli, ["build"])
-        assert result.exit_code != 0
+        result = runner.invoke(cli, ["build"], standalone_mode=False)
+        assert isinstance(result.exception, click.UsageError)
 
-    def test_build_has_help(self, runner: CliRunner) -> None:
-        """build command should have help text."""
-        result = runner.invoke(cli, ["build", "--help"])
-        assert result.exit_code == 0
-        assert "spec" in result.output.lower()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def build_help(cls, runner: CliRunner) -> Result:
+        """Invoke ``build --help`` once for every help check in the class."""
+        return runner.invoke(cli, ["build", "--help"])
+
+    @pytest.mark.parametrize("needle", ["spec", "--output"])
+    def test_build_help_contains(self, build_help: Result, needle: str) -> None:
+        """build command help should describe its argument and options."""
+        assert build_help.exit_code == 0
+        assert needle in build_help.output.lower()
 
     def test_build_with_valid_spec(
-        self, runner: CliRunner, sample_spec_file: Path
+        self, runner: CliRunner, sample_spec_file: Path, tmp_path: Path
+    ) -> None:
+        """build command should write the CLI (the one end-to-end build)."""
+        result = runner.invoke(
+            cli,
+            ["build", str(sample_spec_file), "--output", str(tmp_path)],
+        )
+        assert result.exit_code == 0
+        # Check that files were created
+        assert (tmp_path / "testcli" / "cli.py").exists()
+
+    def test_build_reads_spec_from_stdin(
+        self,
+        runner: CliRunner,
+        tmp_path: Path,
+        generate_calls: list[tuple[CLISpec, Path]],
+    ) -> None:
+        """build - should load the spec from standard input."""
+        result = runner.invoke(
+            cli, ["build", "-", "--output", str(tmp_path)], input=SAMPLE_SPEC_JSON
+        )
+        assert result.exit_code == 0
+        assert "standard input" in result.output
+        assert generate_calls == [(SAMPLE_SPEC, tmp_path)]
+
+    def test_build_reads_piped_spec_output(
+        self,
+        runner: CliRunner,
+        tmp_path: Path,
+        generate_calls: list[tuple[CLISpec, Path]],
+    ) -> None:
+        """`cli-gen spec ... | cli-gen build -` should build the piped spec."""
+        spec_result = runner.invoke(cli, ["spec", "A counter tool", "--test-mode"])
+        assert spec_result.exit_code == 0
+
+        result = runner.invoke(
+            cli, ["build", "-", "--output", str(tmp_path)], input=spec_result.stdout
+        )
+        assert result.exit_code == 0, result.output
+        expected = CLISpec.model_validate_json(spec_result.stdout)
+        assert generate_calls == [(expected, tmp_path)]
+
+    def test_build_does_not_import_pydantic_ai(
+        self, sample_spec_file: Path, tmp_path: Path
+    ) -> None:
+        """build only renders code, so it should never load pydantic-ai."""
+        # A fresh interpreter, since other tests have already imported it
+        script = (
+            "import sys\n"
+            "from click.testing import CliRunner\n"
+            "from cli_generator.cli import cli\n"
+            f"args = ['build', {str(sample_spec_file)!r}, '-o', {str(tmp_path)!r}]\n"
+            "assert CliRunner().invoke(cli, args).exit_code == 0\n"
+            "print('pydantic_ai' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_build_with_trusted_spec(
+        self,
+        runner: CliRunner,
+        tmp_path: Path,
+        generate_calls: list[tuple[CLISpec, Path]],
+    ) -> None:
+        """build --trust should generate from the same spec without validation."""
+        result = runner.invoke(
+            cli,
+            ["build", "-", "--output", str(tmp_path), "--trust"],
+            input=SAMPLE_SPEC_JSON,
+        )
+        assert result.exit_code == 0
+        assert generate_calls == [(SAMPLE_SPEC, tmp_path)]
+
+    def test_build_prints_plain_summary_when_piped(
+        self,
+        runner: CliRunner,
+        tmp_path: Path,
+        generate_calls: list[tuple[CLISpec, Path]],
+    ) -> None:
+        """Non-terminal output should use plain tab-separated summary rows."""
+        result = runner.invoke(
+            cli, ["build", "-", "--output", str(tmp_path)], input=SAMPLE_SPEC_JSON
+        )
+        assert result.exit_code == 0
+        assert "hello\tSay hello\t-\t-" in result.output
+
+    def test_build_with_invalid_spec_file(
+        self, runner: CliRunner, tmp_path: Path
     ) -> None:
-        """build command should work with valid spec file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = runner.invoke(
-                cli,
-                ["build", str(sample_spec_file), "--output", tmpdir],
-            )
-            assert result.exit_code == 0
-            # Check that files were created
-            assert (Path(tmpdir) / "testcli" / "cli.py").exists()
-
-    def test_build_with_invalid_spec_file(self, runner: CliRunner) -> None:
         """build command should handle invalid spec file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write('{"invalid": "spec"}')
-            spec_file = Path(f.name)
+        spec_file = tmp_path / "bad.json"
+        spec_file.write_text('{"invalid": "spec"}')
 
         result = runner.invoke(cli, ["build", str(spec_file)])
         assert result.exit_code != 0
-        assert "error" in result.output.lower() or "invalid" in result.output.lower()
+        assert _INVALID_RE.search(result.output)
+
+    def test_build_with_malformed_json(self, runner: CliRunner, tmp_path: Path) -> None:
+        """build command should report malformed JSON distinctly."""
+        spec_file = tmp_path / "broken.json"
+        spec_file.write_text('{"name": ')
+
+        result = runner.invoke(cli, ["build", str(spec_file)])
+
+        assert result.exit_code != 0
+        assert "Invalid JSON" in result.output
 
     def test_build_with_nonexistent_file(self, runner: CliRunner) -> None:
         """build command should handle nonexistent file."""
         result = runner.invoke(cli, ["build", "/nonexistent/file.json"])
         assert result.exit_code != 0
-        assert "error" in result.output.lower() or "not found" in result.output.lower()
+        assert _NOT_FOUND_RE.search(result.output)
+
+
+class TestBatchCommand:
+    """Tests for the 'batch' command."""
+
+    def test_batch_requires_file(self, runner: CliRunner) -> None:
+        """batch command should require a descriptions file."""
+        result = runner.invoke(cli, ["batch"], standalone_mode=False)
+        assert isinstance(result.exception, click.UsageError)
 
-    def test_build_has_output_option(self, runner: CliRunner) -> None:
-        """build command should have --output option."""
-        result = runner.invoke(cli, ["build", "--help"])
+    def test_batch_generates_each_cli(self, runner: CliRunner, tmp_path: Path) -> None:
+        """batch command should generate a package per spec."""
+        batch_file = tmp_path / "descriptions.txt"
+        # TestModel names every spec "a", so the output directories collide
+        batch_file.write_text("A counter CLI\nA timer CLI\n")
+        out_dir = tmp_path / "out"
+        result = runner.invoke(
+            cli,
+            ["batch", str(batch_file), "--output", str(out_dir), "--test-mode"],
+        )
         assert result.exit_code == 0
-        assert "--output" in result.output or "-o" in result.output
+        assert sorted(
+            path.relative_to(out_dir).as_posix() for path in out_dir.glob("*/*/cli.py")
+        ) == ["a/a/cli.py", "a_2/a/cli.py"]
+
+    def test_batch_rejects_empty_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """batch command should fail on a file without descriptions."""
+        batch_file = tmp_path / "descriptions.txt"
+        batch_file.write_text("\n\n")
+        result = runner.invoke(cli, ["batch", str(batch_file), "--test-mode"])
+        assert result.exit_code != 0
+        assert "No descriptions" in result.output
+
+
+class TestEventLoop:
+    """Tests for the event loop shared by generations."""
+
+    def test_run_reuses_loop_and_closes_it_at_exit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """_run should reuse one loop and register its shutdown with atexit."""
+        exit_handlers: list = []
+        monkeypatch.setattr(cli_module, "_runner", None)
+        monkeypatch.setattr(atexit, "register", exit_handlers.append)
+
+        async def running_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        first = cli_module._run(running_loop())
+        second = cli_module._run(running_loop())
+        assert first is second
+
+        # What the interpreter runs on exit
+        (close,) = exit_handlers
+        close()
+        assert first.is_closed()
 
 
 class TestErrorHandling:
     """Tests for error handling."""
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create a CLI test runner."""
-        return CliRunner()
-
     def test_invalid_command_shows_help(self, runner: CliRunner) -> None:
         """Invalid command should show help or error."""
         result = runner.invoke(cli, ["invalid_command"])
@@ -1,12 +1,18 @@
 """Unit tests for CodeGenerator."""
 
 import ast
-import tempfile
+import os
+import re
 from pathlib import Path
 
 import pytest
 
-from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.generators.code_generator import (
+    CodeGenerator,
+    GeneratedFile,
+    _to_func_name,
+    _to_param_name,
+)
 from cli_generator.models import (
     ArgumentSpec,
     CLISpec,
@@ -14,6 +20,193 @@ from cli_generator.models import (
     OptionSpec,
 )
 
+# Run this module on one xdist worker so the session fixtures generate once
+pytestmark = pytest.mark.xdist_group("codegen")
+
+
+# Specs are immutable, so tests share module-level instances
+SIMPLE_SPEC = CLISpec(
+    name="mytool",
+    description="A simple test tool",
+    commands=[
+        CommandSpec(
+            name="greet",
+            description="Greet someone",
+            arguments=[ArgumentSpec(name="name", help="Name to greet")],
+            options=[
+                OptionSpec(
+                    name="loud",
+                    short="l",
+                    type="bool",
+                    help="Greet loudly",
+                )
+            ],
+        )
+    ],
+)
+
+COMPLEX_SPEC = CLISpec(
+    name="fileutil",
+    description="File utility tool",
+    commands=[
+        CommandSpec(
+            name="convert",
+            description="Convert files between formats",
+            arguments=[
+                ArgumentSpec(name="input_file", type="path", help="Input file"),
+            ],
+            options=[
+                OptionSpec(
+                    name="output",
+                    short="o",
+                    type="path",
+                    help="Output file",
+                ),
+                OptionSpec(
+                    name="format",
+                    short="f",
+                    type="choice",
+                    choices=["json", "yaml", "xml"],
+                    default="json",
+                    help="Output format",
+                ),
+                OptionSpec(
+                    name="indent",
+                    short="i",
+                    type="int",
+                    default=2,
+                    help="Indentation level",
+                ),
+            ],
+        ),
+        CommandSpec(
+            name="validate",
+            description="Validate a file",
+            arguments=[
+                ArgumentSpec(name="file", type="path", help="File to validate"),
+            ],
+            options=[
+                OptionSpec(
+                    name="strict",
+                    type="bool",
+                    help="Enable strict validation",
+                ),
+            ],
+        ),
+    ],
+    global_options=[
+        OptionSpec(name="verbose", short="v", type="bool", help="Verbose output"),
+    ],
+)
+
+# One option of every supported type, generated together
+ALL_TYPES_SPEC = CLISpec(
+    name="test",
+    description="Test",
+    commands=[
+        CommandSpec(
+            name="cmd",
+            description="Command",
+            options=[
+                OptionSpec(name="name", type="str", help="Name"),
+                OptionSpec(name="count", type="int", help="Count"),
+                OptionSpec(name="rate", type="float", help="Rate"),
+                OptionSpec(name="verbose", type="bool", help="Verbose"),
+                OptionSpec(name="file", type="path", help="File path"),
+                OptionSpec(
+                    name="format",
+                    type="choice",
+                    choices=["json", "yaml"],
+                    help="Format",
+                ),
+            ],
+        )
+    ],
+)
+
+# Shared by the pyproject.toml and README.md checks
+MYTOOL_SPEC = CLISpec(
+    name="mytool",
+    description="My awesome tool",
+    commands=[
+        CommandSpec(name="convert", description="Convert files"),
+        CommandSpec(name="validate", description="Validate files"),
+    ],
+)
+
+NO_COMMANDS_SPEC = CLISpec(
+    name="simple",
+    description="A simple tool with no subcommands",
+    global_options=[
+        OptionSpec(name="verbose", short="v", type="bool", help="Verbose")
+    ],
+)
+
+# Fragments every command in COMPLEX_SPEC's cli.py should produce
+STRUCTURE_NEEDLES = [
+    "def convert(",
+    "def validate(",
+    "@cli.command(",
+    "@click.argument",
+    "@click.option",
+]
+_STRUCTURE_RE = re.compile("|".join(map(re.escape, STRUCTURE_NEEDLES)))
+
+
+@pytest.fixture(scope="session")
+def simple_generated(
+    code_generator: CodeGenerator, tmp_path_factory: pytest.TempPathFactory
+) -> dict[str, GeneratedFile]:
+    """Generate SIMPLE_SPEC once for all tests that only inspect the output."""
+    return code_generator.generate(SIMPLE_SPEC, tmp_path_factory.mktemp("simple"))
+
+
+@pytest.fixture(scope="session")
+def complex_generated(
+    code_generator: CodeGenerator, tmp_path_factory: pytest.TempPathFactory
+) -> dict[str, GeneratedFile]:
+    """Generate COMPLEX_SPEC once for all tests that only inspect the output."""
+    return code_generator.generate(COMPLEX_SPEC, tmp_path_factory.mktemp("complex"))
+
+
+@pytest.fixture(scope="session")
+def simple_cli_code(simple_generated: dict[str, GeneratedFile]) -> str:
+    """Generated cli.py source for SIMPLE_SPEC."""
+    return simple_generated["cli"].text
+
+
+@pytest.fixture(scope="session")
+def complex_cli_code(complex_generated: dict[str, GeneratedFile]) -> str:
+    """Generated cli.py source for COMPLEX_SPEC."""
+    return complex_generated["cli"].text
+
+
+@pytest.fixture(scope="session")
+def complex_cli_structure(complex_cli_code: str) -> set[str]:
+    """STRUCTURE_NEEDLES found in COMPLEX_SPEC's cli.py, from a single scan."""
+    return set(_STRUCTURE_RE.findall(complex_cli_code))
+
+
+@pytest.fixture(scope="session")
+def simple_cli_ast(simple_generated: dict[str, GeneratedFile]) -> ast.Module:
+    """Parsed cli.py for SIMPLE_SPEC, read back from disk (SyntaxError if invalid)."""
+    return ast.parse(simple_generated["cli"].path.read_text())
+
+
+@pytest.fixture(scope="session")
+def complex_cli_ast(complex_cli_code: str) -> ast.Module:
+    """Parsed cli.py for COMPLEX_SPEC (SyntaxError if invalid)."""
+    return ast.parse(complex_cli_code)
+
+
+def _generate_in_memory(
+    generator: CodeGenerator, spec: CLISpec, output_dir: Path
+) -> dict[str, str]:
+    """Generate spec without writing files, returning each file's text by type."""
+    written: dict[Path, str] = {}
+    result = generator.generate(spec, output_dir, writer=written.__setitem__)
+    return {kind: written[file.path] for kind, file in result.items()}
+
 
 class TestCodeGeneratorInit:
     """Tests for CodeGenerator initialization."""
@@ -24,275 +217,218 @@ class TestCodeGeneratorInit:
         assert gen is not None
 
 
-class TestCodeGeneratorGenerate:
-    """Tests for CodeGenerator.generate() method."""
+class TestNameConversion:
+    """Tests for converting spec names to Python identifiers."""
 
-    @pytest.fixture
-    def generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("convert", "convert"),
+            ("Convert-File", "convert_file"),
+            ("dry run", "dry_run"),
+            ("Ünicode-Name", "ünicode_name"),
+        ],
+    )
+    def test_to_func_name(self, name: str, expected: str) -> None:
+        """Names should be lowercased with dashes/spaces as underscores."""
+        assert _to_func_name(name) == expected
+        assert _to_param_name(name) == expected
 
-    @pytest.fixture
-    def simple_spec(self) -> CLISpec:
-        """Create a simple CLISpec for testing."""
-        return CLISpec(
-            name="mytool",
-            description="A simple test tool",
-            commands=[
-                CommandSpec(
-                    name="greet",
-                    description="Greet someone",
-                    arguments=[ArgumentSpec(name="name", help="Name to greet")],
-                    options=[
-                        OptionSpec(
-                            name="loud",
-                            short="l",
-                            type="bool",
-                            help="Greet loudly",
-                        )
-                    ],
-                )
-            ],
-        )
 
-    @pytest.fixture
-    def complex_spec(self) -> CLISpec:
-        """Create a complex CLISpec with multiple commands and option types."""
-        return CLISpec(
-            name="fileutil",
-            description="File utility tool",
-            commands=[
-                CommandSpec(
-                    name="convert",
-                    description="Convert files between formats",
-                    arguments=[
-                        ArgumentSpec(name="input_file", type="path", help="Input file"),
-                    ],
-                    options=[
-                        OptionSpec(
-                            name="output",
-                            short="o",
-                            type="path",
-                            help="Output file",
-                        ),
-                        OptionSpec(
-                            name="format",
-                            short="f",
-                            type="choice",
-                            choices=["json", "yaml", "xml"],
-                            default="json",
-                            help="Output format",
-                        ),
-                        OptionSpec(
-                            name="indent",
-                            short="i",
-                            type="int",
-                            default=2,
-                            help="Indentation level",
-                        ),
-                    ],
-                ),
-                CommandSpec(
-                    name="validate",
-                    description="Validate a file",
-                    arguments=[
-                        ArgumentSpec(name="file", type="path", help="File to validate"),
-                    ],
-                    options=[
-                        OptionSpec(
-                            name="strict",
-                            type="bool",
-                            help="Enable strict validation",
-                        ),
-                    ],
-                ),
-            ],
-            global_options=[
-                OptionSpec(name="verbose", short="v", type="bool", help="Verbose output"),
-            ],
-        )
+class TestCodeGeneratorGenerate:
+    """Tests for CodeGenerator.generate() method."""
 
     def test_generate_returns_dict(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+        self, simple_generated: dict[str, GeneratedFile]
     ) -> None:
         """generate() should return a dict of file paths."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-
-        assert isinstance(result, dict)
-        assert "cli" in result
-        assert "init" in result
-        assert "pyproject" in result
-        assert "readme" in result
+        assert isinstance(simple_generated, dict)
+        assert "cli" in simple_generated
+        assert "init" in simple_generated
+        assert "pyproject" in simple_generated
+        assert "readme" in simple_generated
 
     def test_generate_creates_files(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+        self, simple_generated: dict[str, GeneratedFile]
     ) -> None:
         """generate() should create actual files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-
-            for path in result.values():
-                assert path.exists(), f"{path} should exist"
+        for path in simple_generated.values():
+            assert path.exists(), f"{path} should exist"
 
-    def test_generated_cli_is_valid_python(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+    def test_generate_returns_written_text(
+        self, simple_generated: dict[str, GeneratedFile]
     ) -> None:
-        """Generated cli.py should be valid Python syntax."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-            cli_path = result["cli"]
-
-            # Read and parse the generated code
-            code = cli_path.read_text()
+        """Each result should carry the exact text written to its path."""
+        for generated in simple_generated.values():
+            assert isinstance(generated, GeneratedFile)
+            assert generated.path.read_text() == generated.text
+            assert os.fspath(generated) == str(generated.path)
 
-            # Should not raise SyntaxError
-            ast.parse(code)
+    def test_generated_cli_is_valid_python(self, simple_cli_ast: ast.Module) -> None:
+        """Generated cli.py should be valid Python syntax."""
+        assert isinstance(simple_cli_ast, ast.Module)
 
-    def test_generated_cli_has_click_imports(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+    def test_generated_complex_cli_is_valid_python(
+        self, complex_cli_ast: ast.Module
     ) -> None:
-        """Generated cli.py should import click."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-            code = result["cli"].read_text()
+        """Generated cli.py with every option type should be valid Python syntax."""
+        assert isinstance(complex_cli_ast, ast.Module)
 
-            assert "import click" in code
+    def test_generated_cli_has_click_imports(self, simple_cli_code: str) -> None:
+        """Generated cli.py should import click."""
+        assert "import click" in simple_cli_code
 
-    def test_generated_cli_has_all_commands(
-        self, generator: CodeGenerator, complex_spec: CLISpec
+    @pytest.mark.parametrize("needle", STRUCTURE_NEEDLES)
+    def test_generated_cli_has_structure(
+        self, complex_cli_structure: set[str], needle: str
     ) -> None:
-        """Generated cli.py should have all commands from spec."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(complex_spec, Path(tmpdir))
-            code = result["cli"].read_text()
+        """Generated cli.py should define every command with its decorators."""
+        assert needle in complex_cli_structure
 
-            # Check that all commands are defined
-            assert "def convert(" in code
-            assert "def validate(" in code
-
-    def test_generated_cli_has_command_decorators(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+    def test_generate_uses_writer(
+        self, code_generator: CodeGenerator, tmp_path: Path
     ) -> None:
-        """Generated cli.py should have @cli.command() decorators."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-            code = result["cli"].read_text()
+        """A custom writer should receive every file instead of the disk."""
+        written: dict[Path, str] = {}
+        result = code_generator.generate(
+            SIMPLE_SPEC, tmp_path, writer=written.__setitem__
+        )
 
-            assert "@cli.command()" in code or '@cli.command("' in code
+        assert written == {file.path: file.text for file in result.values()}
+        assert not result["cli"].exists()
+        assert not (tmp_path / SIMPLE_SPEC.name).exists()
 
-    def test_generated_cli_has_arguments(
-        self, generator: CodeGenerator, simple_spec: CLISpec
-    ) -> None:
-        """Generated cli.py should have @click.argument decorators."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-            code = result["cli"].read_text()
+    def test_equal_specs_reuse_render(self, tmp_path: Path) -> None:
+        """An equal spec should be written from the cached render."""
+        # A fresh generator, so the shared one's cache hits don't count
+        generator = CodeGenerator()
+        first = generator.generate(SIMPLE_SPEC, tmp_path / "a")
+        second = generator.generate(SIMPLE_SPEC.model_copy(deep=True), tmp_path / "b")
 
-            assert "@click.argument" in code
+        assert generator._cached_render.cache_info().hits == 1
+        assert second["cli"].read_text() == first["cli"].read_text()
 
-    def test_generated_cli_has_options(
-        self, generator: CodeGenerator, simple_spec: CLISpec
+    def test_equal_specs_with_different_defaults_render_apart(
+        self, tmp_path: Path
     ) -> None:
-        """Generated cli.py should have @click.option decorators."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(simple_spec, Path(tmpdir))
-            code = result["cli"].read_text()
+        """Specs that compare equal but render differently must not share a render."""
 
-            assert "@click.option" in code
+        def spec_with_default(default: float) -> CLISpec:
+            option = OptionSpec(name="ratio", type="float", default=default)
+            return CLISpec(
+                name="mytool",
+                description="Test",
+                commands=[CommandSpec(name="run", description="Run", options=[option])],
+            )
 
+        generator = CodeGenerator()
+        as_int, as_float = spec_with_default(1), spec_with_default(1.0)
+        assert as_int == as_float
 
-class TestCodeGeneratorOptionTypes:
-    """Tests for correct option type handling."""
+        generator.generate(as_int, tmp_path, writer=lambda *args: None)
+        result = generator.generate(as_float, tmp_path, writer=lambda *args: None)
 
-    @pytest.fixture
-    def generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
+        assert "default=1.0" in result["cli"].text
 
-    def test_string_option_type(self, generator: CodeGenerator) -> None:
-        """String options should use str type."""
-        spec = CLISpec(
-            name="test",
-            description="Test",
-            commands=[
-                CommandSpec(
-                    name="cmd",
-                    description="Command",
-                    options=[OptionSpec(name="name", type="str", help="Name")],
-                )
-            ],
-        )
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
-
-            # String is default, so might not be explicit
-            assert "@click.option" in code
-
-    def test_int_option_type(self, generator: CodeGenerator) -> None:
-        """Int options should use int type."""
+    def test_generate_accepts_non_json_defaults(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
+        """Specs whose defaults can't be serialized to JSON should still render."""
         spec = CLISpec(
-            name="test",
+            name="mytool",
             description="Test",
             commands=[
                 CommandSpec(
-                    name="cmd",
-                    description="Command",
-                    options=[OptionSpec(name="count", type="int", help="Count")],
+                    name="run",
+                    description="Run",
+                    options=[OptionSpec(name="marker", default=object())],
                 )
             ],
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
-
-            assert "type=int" in code
-
-    def test_float_option_type(self, generator: CodeGenerator) -> None:
-        """Float options should use float type."""
-        spec = CLISpec(
-            name="test",
-            description="Test",
-            commands=[
-                CommandSpec(
-                    name="cmd",
-                    description="Command",
-                    options=[OptionSpec(name="rate", type="float", help="Rate")],
-                )
-            ],
-        )
+        # Only hashing and rendering must not raise; the default itself has
+        # no valid Python spelling in the generated code
+        hash(spec)
+        result = code_generator.generate(spec, tmp_path, writer=lambda *args: None)
+        assert "cli" in result
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
 
-            assert "type=float" in code
+class TestCodeGeneratorOptionTypes:
+    """Tests for correct option type handling."""
 
-    def test_bool_option_type(self, generator: CodeGenerator) -> None:
-        """Bool options should use is_flag=True."""
-        spec = CLISpec(
-            name="test",
-            description="Test",
-            commands=[
-                CommandSpec(
-                    name="cmd",
-                    description="Command",
-                    options=[OptionSpec(name="verbose", type="bool", help="Verbose")],
-                )
-            ],
+    @pytest.fixture(scope="class")
+    @classmethod
+    def all_types_code(
+        cls, code_generator: CodeGenerator, tmp_path_factory: pytest.TempPathFactory
+    ) -> str:
+        """Generate ALL_TYPES_SPEC once for every option type check."""
+        result = code_generator.generate(
+            ALL_TYPES_SPEC, tmp_path_factory.mktemp("all_types")
         )
+        return result["cli"].text
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
-
-            assert "is_flag=True" in code
+    @pytest.mark.parametrize(
+        "needle",
+        [
+            # String is default, so might not be explicit
+            "@click.option",
+            "type=int",
+            "type=float",
+            "is_flag=True",
+            "click.Path",
+            "click.Choice",
+            "json",
+            "yaml",
+        ],
+    )
+    def test_option_type_emitted(self, all_types_code: str, needle: str) -> None:
+        """Each option type should map to its Click declaration."""
+        assert needle in all_types_code
+
+
+class TestCodeGeneratorHasPathTypes:
+    """Tests for detecting path-typed arguments and options."""
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            CLISpec(
+                name="test",
+                description="Test",
+                global_options=[OptionSpec(name="config", type="path")],
+            ),
+            CLISpec(
+                name="test",
+                description="Test",
+                commands=[
+                    CommandSpec(
+                        name="cmd",
+                        description="Command",
+                        arguments=[ArgumentSpec(name="src", type="path")],
+                    )
+                ],
+            ),
+            CLISpec(
+                name="test",
+                description="Test",
+                commands=[
+                    CommandSpec(
+                        name="cmd",
+                        description="Command",
+                        options=[OptionSpec(name="out", type="path")],
+                    )
+                ],
+            ),
+        ],
+    )
+    def test_detects_path_types(
+        self, code_generator: CodeGenerator, spec: CLISpec
+    ) -> None:
+        """Path types anywhere in the spec should be detected."""
+        assert code_generator._has_path_types(spec) is True
 
-    def test_path_option_type(self, generator: CodeGenerator) -> None:
-        """Path options should use click.Path type."""
+    def test_no_path_types(self, code_generator: CodeGenerator) -> None:
+        """Specs without path types should not need the Path import."""
         spec = CLISpec(
             name="test",
             description="Test",
@@ -300,165 +436,109 @@ class TestCodeGeneratorOptionTypes:
                 CommandSpec(
                     name="cmd",
                     description="Command",
-                    options=[OptionSpec(name="file", type="path", help="File path")],
+                    arguments=[ArgumentSpec(name="name")],
+                    options=[OptionSpec(name="count", type="int")],
                 )
             ],
         )
+        assert code_generator._has_path_types(spec) is False
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
-
-            assert "click.Path" in code
-
-    def test_choice_option_type(self, generator: CodeGenerator) -> None:
-        """Choice options should use click.Choice type."""
-        spec = CLISpec(
-            name="test",
-            description="Test",
-            commands=[
-                CommandSpec(
-                    name="cmd",
-                    description="Command",
-                    options=[
-                        OptionSpec(
-                            name="format",
-                            type="choice",
-                            choices=["json", "yaml"],
-                            help="Format",
-                        )
-                    ],
-                )
-            ],
+    def test_detects_path_option_added_by_copy(
+        self, code_generator: CodeGenerator
+    ) -> None:
+        """A path option added via model_copy should not hide behind old columns."""
+        command = CommandSpec(
+            name="cmd", description="Command", options=[OptionSpec(name="count")]
         )
+        assert command.columns.opt_types == ("str",)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
-
-            assert "click.Choice" in code
-            assert "json" in code
-            assert "yaml" in code
+        extra = OptionSpec(name="extra", type="path")
+        extended = command.model_copy(update={"options": (*command.options, extra)})
+        spec = CLISpec(name="test", description="Test", commands=[extended])
+        assert code_generator._has_path_types(spec) is True
 
 
 class TestCodeGeneratorPyproject:
     """Tests for pyproject.toml generation."""
 
-    @pytest.fixture
-    def generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
-    def test_pyproject_has_name(self, generator: CodeGenerator) -> None:
+    def test_pyproject_has_name(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated pyproject.toml should have correct name."""
-        spec = CLISpec(name="mytool", description="My tool")
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["pyproject"].read_text()
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["pyproject"]
 
-            assert 'name = "mytool"' in content
+        assert 'name = "mytool"' in content
 
-    def test_pyproject_has_description(self, generator: CodeGenerator) -> None:
+    def test_pyproject_has_description(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated pyproject.toml should have description."""
-        spec = CLISpec(name="mytool", description="My awesome tool")
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["pyproject"].read_text()
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["pyproject"]
 
-            assert "My awesome tool" in content
+        assert "My awesome tool" in content
 
-    def test_pyproject_has_click_dependency(self, generator: CodeGenerator) -> None:
+    def test_pyproject_has_click_dependency(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated pyproject.toml should include click dependency."""
-        spec = CLISpec(name="mytool", description="My tool")
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["pyproject"]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["pyproject"].read_text()
+        assert "click" in content
 
-            assert "click" in content
-
-    def test_pyproject_has_entry_point(self, generator: CodeGenerator) -> None:
+    def test_pyproject_has_entry_point(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated pyproject.toml should have console script entry point."""
-        spec = CLISpec(name="mytool", description="My tool")
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["pyproject"]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["pyproject"].read_text()
-
-            assert "[project.scripts]" in content
-            assert "mytool" in content
+        assert "[project.scripts]" in content
+        assert "mytool" in content
 
 
 class TestCodeGeneratorReadme:
     """Tests for README.md generation."""
 
-    @pytest.fixture
-    def generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
-    def test_readme_has_name(self, generator: CodeGenerator) -> None:
+    def test_readme_has_name(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated README.md should have CLI name."""
-        spec = CLISpec(name="mytool", description="My tool")
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["readme"]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["readme"].read_text()
+        assert "mytool" in content
 
-            assert "mytool" in content
-
-    def test_readme_has_description(self, generator: CodeGenerator) -> None:
+    def test_readme_has_description(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated README.md should have description."""
-        spec = CLISpec(name="mytool", description="My awesome tool")
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["readme"]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["readme"].read_text()
+        assert "My awesome tool" in content
 
-            assert "My awesome tool" in content
-
-    def test_readme_has_commands(self, generator: CodeGenerator) -> None:
+    def test_readme_has_commands(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """Generated README.md should document commands."""
-        spec = CLISpec(
-            name="mytool",
-            description="My tool",
-            commands=[
-                CommandSpec(name="convert", description="Convert files"),
-                CommandSpec(name="validate", description="Validate files"),
-            ],
-        )
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            content = result["readme"].read_text()
+        result = _generate_in_memory(code_generator, MYTOOL_SPEC, tmp_path)
+        content = result["readme"]
 
-            assert "convert" in content
-            assert "validate" in content
+        assert "convert" in content
+        assert "validate" in content
 
 
 class TestCodeGeneratorNoCommands:
     """Tests for CLISpec with no commands (single-command CLI)."""
 
-    @pytest.fixture
-    def generator(self) -> CodeGenerator:
-        """Create a CodeGenerator instance."""
-        return CodeGenerator()
-
-    def test_cli_with_no_commands_is_valid(self, generator: CodeGenerator) -> None:
+    def test_cli_with_no_commands_is_valid(
+        self, code_generator: CodeGenerator, tmp_path: Path
+    ) -> None:
         """CLI with no commands should still generate valid Python."""
-        spec = CLISpec(
-            name="simple",
-            description="A simple tool with no subcommands",
-            global_options=[
-                OptionSpec(name="verbose", short="v", type="bool", help="Verbose")
-            ],
-        )
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = generator.generate(spec, Path(tmpdir))
-            code = result["cli"].read_text()
+        code = _generate_in_memory(code_generator, NO_COMMANDS_SPEC, tmp_path)["cli"]
 
-            # Should be valid Python
-            ast.parse(code)
+        # Should be valid Python
+        ast.parse(code)
@@ -1,9 +1,20 @@
 """Unit tests for Pydantic models."""
 
+import sys
+from typing import Any
+
 import pytest
 from pydantic import ValidationError
 
-from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+from cli_generator.models import (
+    ArgumentSpec,
+    CLISpec,
+    CommandColumns,
+    CommandSpec,
+    OptionSpec,
+)
+
+pytestmark = pytest.mark.sync_models
 
 
 class TestArgumentSpec:
@@ -11,15 +22,17 @@ class TestArgumentSpec:
 
     def test_create_minimal_argument(self) -> None:
         """Create argument with only required fields."""
-        arg = ArgumentSpec(name="filename")
-        assert arg.name == "filename"
-        assert arg.type == "str"
-        assert arg.required is True
-        assert arg.help == ""
+        arg = ArgumentSpec.construct_trusted(name="filename")
+        assert arg.model_dump() == {
+            "name": "filename",
+            "type": "str",
+            "required": True,
+            "help": "",
+        }
 
     def test_create_full_argument(self) -> None:
         """Create argument with all fields."""
-        arg = ArgumentSpec(
+        arg = ArgumentSpec.construct_trusted(
             name="count",
             type="int",
             required=False,
@@ -41,18 +54,20 @@ class TestOptionSpec:
 
     def test_create_minimal_option(self) -> None:
         """Create option with only required fields."""
-        opt = OptionSpec(name="output")
-        assert opt.name == "output"
-        assert opt.short is None
-        assert opt.type == "str"
-        assert opt.required is False
-        assert opt.default is None
-        assert opt.help == ""
-        assert opt.choices is None
+        opt = OptionSpec.construct_trusted(name="output")
+        assert opt.model_dump() == {
+            "name": "output",
+            "short": None,
+            "type": "str",
+            "required": False,
+            "default": None,
+            "help": "",
+            "choices": None,
+        }
 
     def test_create_full_option(self) -> None:
         """Create option with all fields."""
-        opt = OptionSpec(
+        opt = OptionSpec.construct_trusted(
             name="format",
             short="f",
             type="choice",
@@ -67,7 +82,7 @@ class TestOptionSpec:
         assert opt.required is True
         assert opt.default == "json"
         assert opt.help == "Output format"
-        assert opt.choices == ["json", "yaml", "xml"]
+        assert opt.choices == ("json", "yaml", "xml")
 
     def test_short_option_single_character(self) -> None:
         """Short option must be single character."""
@@ -77,9 +92,8 @@ class TestOptionSpec:
 
     def test_short_option_multiple_characters_fails(self) -> None:
         """Short option with multiple characters should fail validation."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"(?i)single character"):
             OptionSpec(name="output", short="out")
-        assert "single character" in str(exc_info.value).lower()
 
     def test_short_option_empty_string_becomes_none(self) -> None:
         """Short option as empty string should be converted to None."""
@@ -102,35 +116,82 @@ class TestOptionSpec:
         opt = OptionSpec(name="--output-dir")
         assert opt.name == "output-dir"
 
-    def test_choice_type_requires_choices_list(self) -> None:
-        """Option with type='choice' must have choices list."""
-        with pytest.raises(ValidationError) as exc_info:
-            OptionSpec(name="format", type="choice")
-        assert "choice" in str(exc_info.value).lower()
-
-    def test_choice_type_with_none_choices_fails(self) -> None:
-        """Option with type='choice' and choices=None should fail."""
-        with pytest.raises(ValidationError) as exc_info:
-            OptionSpec(name="format", type="choice", choices=None)
-        assert "choice" in str(exc_info.value).lower()
-
-    def test_choice_type_with_empty_choices_fails(self) -> None:
-        """Option with type='choice' and empty choices should fail."""
-        with pytest.raises(ValidationError) as exc_info:
-            OptionSpec(name="format", type="choice", choices=[])
-        assert "choice" in str(exc_info.value).lower()
+    @pytest.mark.parametrize(
+        "choices",
+        [{}, {"choices": None}, {"choices": []}],
+        ids=["missing", "none", "empty"],
+    )
+    def test_choice_type_requires_choices_list(self, choices: dict[str, Any]) -> None:
+        """Option with type='choice' must have a non-empty choices list."""
+        with pytest.raises(ValidationError, match=r"(?i)choice"):
+            OptionSpec(name="format", type="choice", **choices)
 
     def test_choice_type_with_choices_is_valid(self) -> None:
         """Option with type='choice' and valid choices should work."""
         opt = OptionSpec(name="format", type="choice", choices=["json", "yaml", "xml"])
         assert opt.type == "choice"
-        assert opt.choices == ["json", "yaml", "xml"]
+        assert opt.choices == ("json", "yaml", "xml")
 
     def test_non_choice_type_with_choices_is_valid(self) -> None:
         """Non-choice type can have choices list (ignored but allowed)."""
         opt = OptionSpec(name="output", type="str", choices=["a", "b"])
         assert opt.type == "str"
-        assert opt.choices == ["a", "b"]
+        assert opt.choices == ("a", "b")
+
+    def test_type_is_interned(self) -> None:
+        """Type names built at runtime should share the interned string."""
+        opt = OptionSpec(name="output", type="".join(["pa", "th"]))
+        assert opt.type is sys.intern("path")
+
+
+class TestClickDecorator:
+    """Tests for the cached click_decorator of arguments and options."""
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            (
+                ArgumentSpec(name="src", type="path", required=False),
+                '@click.argument("src", type=click.Path(exists=True), required=False)',
+            ),
+            (
+                OptionSpec(
+                    name="format",
+                    short="f",
+                    type="choice",
+                    choices=["json", "yaml"],
+                    default="json",
+                    help='Output "format"',
+                ),
+                '@click.option("-f", "--format", type=click.Choice(["json", "yaml"]), '
+                'default="json", help="Output \\"format\\"")',
+            ),
+        ],
+        ids=["argument", "option"],
+    )
+    def test_click_decorator(
+        self, spec: ArgumentSpec | OptionSpec, expected: str
+    ) -> None:
+        """Each spec should render its decorator once and reuse it."""
+        assert spec.click_decorator == expected
+        assert spec.click_decorator is spec.click_decorator
+
+    def test_click_decorator_not_serialized(self) -> None:
+        """Rendered decorators must not leak into the spec JSON."""
+        opt = OptionSpec(name="verbose", type="bool")
+        assert opt.click_decorator == '@click.option("--verbose", is_flag=True)'
+        assert "click_decorator" not in opt.model_dump()
+
+    def test_click_decorator_follows_choices(self) -> None:
+        """Changed choices must be rendered, not the first cached decorator."""
+        opt = OptionSpec(name="format", type="choice", choices=["json"])
+        assert 'click.Choice(["json"])' in opt.click_decorator
+
+        # Choices are a tuple, so the only way to change them is a copy
+        with pytest.raises(AttributeError):
+            opt.choices.append("yaml")  # type: ignore[union-attr]
+        widened = opt.model_copy(update={"choices": ("json", "yaml")})
+        assert 'click.Choice(["json", "yaml"])' in widened.click_decorator
 
 
 class TestCommandSpec:
@@ -138,20 +199,24 @@ class TestCommandSpec:
 
     def test_create_minimal_command(self) -> None:
         """Create command with only required fields."""
-        cmd = CommandSpec(name="build", description="Build the project")
-        assert cmd.name == "build"
-        assert cmd.description == "Build the project"
-        assert cmd.arguments == []
-        assert cmd.options == []
-        assert cmd.examples == []
+        cmd = CommandSpec.construct_trusted(
+            name="build", description="Build the project"
+        )
+        assert cmd.model_dump() == {
+            "name": "build",
+            "description": "Build the project",
+            "arguments": (),
+            "options": (),
+            "examples": (),
+        }
 
     def test_create_full_command(self) -> None:
         """Create command with all fields."""
-        cmd = CommandSpec(
+        cmd = CommandSpec.construct_trusted(
             name="convert",
             description="Convert files",
-            arguments=[ArgumentSpec(name="input")],
-            options=[OptionSpec(name="output", short="o")],
+            arguments=[{"name": "input"}],
+            options=[{"name": "output", "short": "o"}],
             examples=["convert file.txt -o output.txt"],
         )
         assert cmd.name == "convert"
@@ -159,44 +224,43 @@ class TestCommandSpec:
         assert len(cmd.options) == 1
         assert len(cmd.examples) == 1
 
-    def test_no_duplicate_option_names(self) -> None:
-        """Command cannot have duplicate option names."""
-        with pytest.raises(ValidationError) as exc_info:
-            CommandSpec(
-                name="test",
-                description="Test command",
-                options=[
-                    OptionSpec(name="output", short="o"),
-                    OptionSpec(name="output", short="u"),  # Duplicate name
-                ],
-            )
-        assert "duplicate" in str(exc_info.value).lower()
-
-    def test_no_duplicate_option_short_names(self) -> None:
-        """Command cannot have duplicate short option names."""
-        with pytest.raises(ValidationError) as exc_info:
-            CommandSpec(
-                name="test",
-                description="Test command",
-                options=[
-                    OptionSpec(name="output", short="o"),
-                    OptionSpec(name="outfile", short="o"),  # Duplicate short
-                ],
-            )
-        assert "duplicate" in str(exc_info.value).lower()
-
-    def test_no_duplicate_argument_names(self) -> None:
-        """Command cannot have duplicate argument names."""
-        with pytest.raises(ValidationError) as exc_info:
-            CommandSpec(
-                name="test",
-                description="Test command",
-                arguments=[
-                    ArgumentSpec(name="input"),
-                    ArgumentSpec(name="input"),  # Duplicate
-                ],
-            )
-        assert "duplicate" in str(exc_info.value).lower()
+    @pytest.mark.parametrize(
+        "members",
+        [
+            {
+                "options": [
+                    OptionSpec.construct_trusted(name="output", short="o"),
+                    OptionSpec.construct_trusted(name="output", short="u"),
+                ]
+            },
+            {
+                "options": [
+                    OptionSpec.construct_trusted(name="output", short="o"),
+                    OptionSpec.construct_trusted(name="outfile", short="o"),
+                ]
+            },
+            {
+                "arguments": [
+                    ArgumentSpec.construct_trusted(name="input"),
+                    ArgumentSpec.construct_trusted(name="input"),
+                ]
+            },
+        ],
+        ids=["option-name", "option-short", "argument-name"],
+    )
+    def test_no_duplicate_names(self, members: dict[str, Any]) -> None:
+        """Command cannot repeat an option name, short name or argument name."""
+        with pytest.raises(ValidationError, match=r"(?i)duplicate"):
+            CommandSpec(name="test", description="Test command", **members)
+
+    def test_options_without_short_names_are_not_duplicates(self) -> None:
+        """Several options may omit the short name."""
+        cmd = CommandSpec(
+            name="test",
+            description="Test command",
+            options=[OptionSpec(name="output"), OptionSpec(name="verbose")],
+        )
+        assert [opt.short for opt in cmd.options] == [None, None]
 
     def test_unique_options_are_valid(self) -> None:
         """Command with unique options should be valid."""
@@ -211,30 +275,54 @@ class TestCommandSpec:
         )
         assert len(cmd.options) == 3
 
+    def test_column_view_matches_fields(self) -> None:
+        """Column view should mirror argument and option types in order."""
+        cmd = CommandSpec(
+            name="convert",
+            description="Convert files",
+            arguments=[ArgumentSpec(name="input", type="path")],
+            options=[
+                OptionSpec(name="count", type="int", default=2),
+                OptionSpec(name="verbose", type="bool"),
+            ],
+        )
+        assert cmd.columns == CommandColumns(
+            arg_types=("path",), opt_types=("int", "bool")
+        )
+        assert cmd.columns is cmd.columns
+
+    def test_column_view_not_serialized(self) -> None:
+        """Column view is derived data and must not appear in dumps."""
+        cmd = CommandSpec(name="build", description="Build the project")
+        assert cmd.columns == CommandColumns(arg_types=(), opt_types=())
+        assert "columns" not in cmd.model_dump()
+
 
 class TestCLISpec:
     """Tests for CLISpec model."""
 
     def test_create_minimal_cli(self) -> None:
         """Create CLI with only required fields."""
-        cli = CLISpec(name="mytool", description="My awesome tool")
-        assert cli.name == "mytool"
-        assert cli.description == "My awesome tool"
-        assert cli.commands == []
-        assert cli.global_options == []
-        assert cli.python_version == "3.11"
-        assert cli.dependencies == []
+        cli = CLISpec.construct_trusted(name="mytool", description="My awesome tool")
+        assert cli.model_dump() == {
+            "name": "mytool",
+            "description": "My awesome tool",
+            "commands": (),
+            "global_options": (),
+            "python_version": "3.11",
+            "dependencies": (),
+        }
 
     def test_create_full_cli(self) -> None:
         """Create CLI with all fields."""
-        cli = CLISpec(
+        cli = CLISpec.construct_trusted(
             name="imgconvert",
             description="Image converter",
             commands=[
-                CommandSpec(name="convert", description="Convert images"),
-                CommandSpec(name="resize", description="Resize images"),
+                {"name": "convert", "description": "Convert images"},
+                {"name": "resize", "description": "Resize images"},
             ],
-            global_options=[OptionSpec(name="verbose", short="v")],
+            global_options=[{"name": "verbose", "short": "v"}],
             python_version="3.12",
             dependencies=["pillow", "click"],
         )
@@ -242,52 +330,36 @@ class TestCLISpec:
         assert len(cli.commands) == 2
         assert len(cli.global_options) == 1
 
-    def test_valid_python_package_name(self) -> None:
+    @pytest.mark.parametrize("name", ["mytool", "my_tool", "mytool123", "_private"])
+    def test_valid_python_package_name(self, name: str) -> None:
         """CLI name must be valid Python package name."""
-        # Valid names
-        CLISpec(name="mytool", description="Test")
-        CLISpec(name="my_tool", description="Test")
-        CLISpec(name="mytool123", description="Test")
-        CLISpec(name="_private", description="Test")
-
-    def test_invalid_package_name_with_hyphen(self) -> None:
-        """CLI name with hyphen is invalid for Python package."""
-        with pytest.raises(ValidationError) as exc_info:
-            CLISpec(name="my-tool", description="Test")
-        assert "valid python package name" in str(exc_info.value).lower()
-
-    def test_invalid_package_name_starts_with_number(self) -> None:
-        """CLI name starting with number is invalid."""
-        with pytest.raises(ValidationError) as exc_info:
-            CLISpec(name="123tool", description="Test")
-        assert "valid python package name" in str(exc_info.value).lower()
-
-    def test_invalid_package_name_with_spaces(self) -> None:
-        """CLI name with spaces is invalid."""
-        with pytest.raises(ValidationError) as exc_info:
-            CLISpec(name="my tool", description="Test")
-        assert "valid python package name" in str(exc_info.value).lower()
-
-    def test_invalid_package_name_with_special_chars(self) -> None:
-        """CLI name with special characters is invalid."""
-        with pytest.raises(ValidationError) as exc_info:
-            CLISpec(name="my@tool", description="Test")
-        assert "valid python package name" in str(exc_info.value).lower()
+        assert CLISpec(name=name, description="Test").name == name
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "my-tool",  # hyphen
+            "123tool",  # leading digit
+            "my tool",  # space
+            "my@tool",  # special character
+            "tööl",  # non-ASCII
+            "mytool\n",  # trailing newline
+            "import",  # Python keyword
+        ],
+    )
+    def test_invalid_package_name(self, name: str) -> None:
+        """CLI name must be a plain ASCII identifier that isn't a keyword."""
+        with pytest.raises(ValidationError, match=r"(?i)valid python package name"):
+            CLISpec(name=name, description="Test")
 
     def test_invalid_package_name_empty(self) -> None:
         """CLI name cannot be empty."""
         with pytest.raises(ValidationError):
             CLISpec(name="", description="Test")
 
-    def test_invalid_package_name_python_keyword(self) -> None:
-        """CLI name cannot be a Python keyword."""
-        with pytest.raises(ValidationError) as exc_info:
-            CLISpec(name="import", description="Test")
-        assert "valid python package name" in str(exc_info.value).lower()
-
     def test_no_duplicate_command_names(self) -> None:
         """CLI cannot have duplicate command names."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"(?i)duplicate"):
             CLISpec(
                 name="mytool",
                 description="Test",
@@ -296,7 +368,6 @@ class TestCLISpec:
                     CommandSpec(name="build", description="Also build"),  # Duplicate
                 ],
             )
-        assert "duplicate" in str(exc_info.value).lower()
 
     def test_unique_commands_are_valid(self) -> None:
         """CLI with unique command names should be valid."""
@@ -313,7 +384,7 @@ class TestCLISpec:
 
     def test_no_duplicate_global_option_names(self) -> None:
         """CLI cannot have duplicate global option names."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"(?i)duplicate"):
             CLISpec(
                 name="mytool",
                 description="Test",
@@ -322,4 +393,63 @@ class TestCLISpec:
                     OptionSpec(name="verbose", short="V"),  # Duplicate
                 ],
             )
-        assert "duplicate" in str(exc_info.value).lower()
+
+    def test_spec_is_immutable(self) -> None:
+        """Validated specs are frozen and reject attribute assignment."""
+        cli = CLISpec(name="mytool", description="Test")
+        with pytest.raises(ValidationError):
+            cli.name = "other"  # type: ignore[misc]
+
+    def test_construct_trusted_builds_nested_models(self) -> None:
+        """construct_trusted should build nested dicts into models unvalidated."""
+        cli = CLISpec.construct_trusted(
+            name="mytool",
+            description="Test",
+            commands=[
+                {"name": "run", "description": "Run", "options": [{"name": "fast"}]},
+            ],
+            global_options=[{"name": "verbose", "type": "bool"}],
+        )
+
+        assert isinstance(cli.commands[0], CommandSpec)
+        assert isinstance(cli.commands[0].options[0], OptionSpec)
+        assert cli.commands[0].options[0].type == "str"
+        assert isinstance(cli.global_options[0], OptionSpec)
+        assert cli.model_dump() == CLISpec.model_validate(cli.model_dump()).model_dump()
+
+    def test_nested_specs_are_not_copied(self) -> None:
+        """Already-validated commands should be stored as-is, not revalidated."""
+        command = CommandSpec(name="build", description="Build")
+        cli = CLISpec(name="mytool", description="Test", commands=[command])
+        assert cli.commands[0] is command
+
+    def test_equal_specs_hash_equally(self) -> None:
+        """Specs with equal fields should be usable as equal dict keys."""
+        first = CLISpec(
+            name="mytool",
+            description="Test",
+            commands=[CommandSpec(name="build", description="Build")],
+        )
+        second = first.model_copy(deep=True)
+        assert hash(first) == hash(second)
+        assert {first: "cached"}[second] == "cached"
+
+    def test_collections_are_immutable(self) -> None:
+        """List input should be stored as tuples, so specs can't change in place."""
+        cli = CLISpec(
+            name="mytool",
+            description="Test",
+            commands=[{"name": "build", "description": "Build", "options": []}],
+            dependencies=["requests"],
+        )
+        assert cli.commands[0].options == ()
+        assert cli.dependencies == ("requests",)
+        with pytest.raises(AttributeError):
+            cli.commands.append(CommandSpec(name="test", description="Test"))
+
+    def test_unknown_fields_are_rejected(self) -> None:
+        """Misspelled or unknown keys should fail instead of being dropped."""
+        with pytest.raises(ValidationError, match="comands"):
+            CLISpec.model_validate(
+                {"name": "mytool", "description": "Test", "comands": []}
+            )
@@ -1,12 +1,27 @@
 """Unit tests for SpecGenerator."""
 
+from pathlib import Path
+
 import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.models.function import FunctionModel, AgentInfo
-from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
 
-from cli_generator.generators.spec_generator import SpecGenerator
-from cli_generator.models import CLISpec, CommandSpec, OptionSpec, ArgumentSpec
+from cli_generator.cache import SpecCache
+from cli_generator.generators.spec_generator import PROMPT_CACHE_SETTINGS, SpecGenerator
+from cli_generator.models import CLISpec, CommandSpec
+
+pytestmark = pytest.mark.agent
+
+# override() only swaps the model in, so one instance serves every test
+_TEST_MODEL = TestModel()
+
+# Hand-written and known valid, so built once without validation
+BASE_SPEC = CLISpec.construct_trusted(
+    name="mytool",
+    description="A test tool",
+    commands=[{"name": "existing", "description": "An existing command"}],
+)
 
 
 class TestSpecGeneratorInit:
@@ -22,155 +37,182 @@ class TestSpecGeneratorInit:
         gen = SpecGenerator(model="anthropic:claude-3-5-sonnet-latest")
         assert gen.model == "anthropic:claude-3-5-sonnet-latest"
 
+    def test_model_instances_are_told_apart(self) -> None:
+        """Model instances should be identified by provider and model name."""
+
+        # Never called; FunctionModel names itself after its function
+        def first(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            return ModelResponse(parts=[])
+
+        def second(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            return ModelResponse(parts=[])
+
+        assert SpecGenerator(model=TestModel()).model == "test:test"
+        assert (
+            SpecGenerator(model=FunctionModel(first)).model
+            != SpecGenerator(model=FunctionModel(second)).model
+        )
+
+    def test_agents_enable_prompt_caching(self) -> None:
+        """Both agents should request provider prompt caching."""
+        gen = SpecGenerator()
+        assert gen.agent.model_settings == PROMPT_CACHE_SETTINGS
+        assert gen.command_agent.model_settings == PROMPT_CACHE_SETTINGS
+
 
 class TestSpecGeneratorGenerate:
     """Tests for SpecGenerator.generate() method."""
 
-    @pytest.fixture
-    def generator(self) -> SpecGenerator:
-        """Create a SpecGenerator instance."""
-        return SpecGenerator()
-
-    @pytest.mark.asyncio
-    async def test_generate_simple_cli(self, generator: SpecGenerator) -> None:
-        """Generate a simple CLI from description."""
+    @pytest.mark.parametrize(
+        "description",
+        [
+            "A CLI that converts images between formats",
+            "A file manager CLI with list, copy, and delete commands",
+        ],
+    )
+    async def test_generate_returns_clispec(
+        self, spec_generator: SpecGenerator, description: str
+    ) -> None:
+        """Generate a CLISpec from a description."""
         # Use TestModel to mock LLM response
-        with generator.agent.override(model=TestModel()):
-            result = await generator.generate(
-                "A CLI that converts images between formats"
-            )
+        with spec_generator.agent.override(model=_TEST_MODEL):
+            result = await spec_generator.generate(description)
 
         # TestModel returns valid structured data based on schema
         assert isinstance(result, CLISpec)
         assert result.name  # Should have a name
         assert result.description  # Should have a description
 
-    @pytest.mark.asyncio
-    async def test_generate_returns_clispec(self, generator: SpecGenerator) -> None:
-        """Generate method should return CLISpec type."""
-
-        def mock_response(
-            messages: list[ModelMessage], info: AgentInfo
-        ) -> ModelResponse:
-            """Return a mock CLISpec as structured output."""
-            # FunctionModel needs to return the structured data
-            return ModelResponse(
-                parts=[
-                    TextPart(
-                        content='{"name": "imgconvert", "description": "Convert images between formats"}'
-                    )
-                ]
-            )
-
-        with generator.agent.override(model=TestModel()):
-            result = await generator.generate("Convert images")
-
-        assert isinstance(result, CLISpec)
-
-    @pytest.mark.asyncio
-    async def test_generate_with_commands(self, generator: SpecGenerator) -> None:
-        """Generated CLI should have commands when appropriate."""
-        with generator.agent.override(model=TestModel()):
-            result = await generator.generate(
-                "A file manager CLI with list, copy, and delete commands"
-            )
-
-        assert isinstance(result, CLISpec)
-        # TestModel generates valid data based on schema
-
-    @pytest.mark.asyncio
     async def test_generate_empty_description_raises(
-        self, generator: SpecGenerator
+        self, spec_generator: SpecGenerator
     ) -> None:
         """Empty description should raise ValueError."""
         with pytest.raises(ValueError, match="description"):
-            await generator.generate("")
+            await spec_generator.generate("")
 
-    @pytest.mark.asyncio
     async def test_generate_whitespace_description_raises(
-        self, generator: SpecGenerator
+        self, spec_generator: SpecGenerator
     ) -> None:
         """Whitespace-only description should raise ValueError."""
         with pytest.raises(ValueError, match="description"):
-            await generator.generate("   ")
+            await spec_generator.generate("   ")
 
 
-class TestSpecGeneratorAddCommand:
-    """Tests for SpecGenerator.add_command() method."""
+class TestSpecGeneratorCache:
+    """Tests for SpecGenerator.generate() with a SpecCache."""
 
-    @pytest.fixture
-    def generator(self) -> SpecGenerator:
-        """Create a SpecGenerator instance."""
-        return SpecGenerator()
+    async def test_cache_hit_skips_llm(self, tmp_path: Path) -> None:
+        """A cached description should not call the model again."""
+        with SpecCache(tmp_path / "specs.db") as cache:
+            generator = SpecGenerator(cache=cache)
+            cache.put(generator.model, "A simple counter tool", BASE_SPEC)
 
-    @pytest.fixture
-    def base_spec(self) -> CLISpec:
-        """Create a base CLISpec for testing."""
-        return CLISpec(
-            name="mytool",
-            description="A test tool",
-            commands=[
-                CommandSpec(name="existing", description="An existing command")
-            ],
-        )
+            # A real model call would fail without an API key
+            result = await generator.generate("A simple counter tool")
+
+        assert result == BASE_SPEC
+
+    async def test_cache_miss_stores_spec(self, tmp_path: Path) -> None:
+        """A generated spec should be cached under the generator's model."""
+        with SpecCache(tmp_path / "specs.db") as cache:
+            # Passed in directly, not overridden, so the cache key names it
+            generator = SpecGenerator(model=TestModel(), cache=cache)
+            result = await generator.generate("A simple counter tool")
+
+            assert cache.get("test:test", "A simple counter tool") == result
+
+
+class TestSpecGeneratorGenerateMany:
+    """Tests for SpecGenerator.generate_many() method."""
+
+    async def test_generate_many_returns_one_spec_per_description(
+        self, spec_generator: SpecGenerator
+    ) -> None:
+        """generate_many should return a CLISpec for each description."""
+        with spec_generator.agent.override(model=_TEST_MODEL):
+            result = await spec_generator.generate_many(
+                ["A word counter", "A URL shortener", "An image converter"]
+            )
+
+        assert len(result) == 3
+        assert all(isinstance(spec, CLISpec) for spec in result)
+
+    async def test_generate_many_empty_description_raises(
+        self, spec_generator: SpecGenerator
+    ) -> None:
+        """Any empty description should raise ValueError."""
+        with pytest.raises(ValueError, match="description"):
+            await spec_generator.generate_many(["A word counter", "  "])
+
+
+class TestSpecGeneratorAddCommand:
+    """Tests for SpecGenerator.add_command() method."""
 
-    @pytest.mark.asyncio
     async def test_add_command_returns_clispec(
-        self, generator: SpecGenerator, base_spec: CLISpec
+        self, spec_generator: SpecGenerator
     ) -> None:
         """add_command should return CLISpec."""
-        with generator.command_agent.override(model=TestModel()):
-            result = await generator.add_command(
-                base_spec, "Add a search command that finds files"
+        with spec_generator.command_agent.override(model=_TEST_MODEL):
+            result = await spec_generator.add_command(
+                BASE_SPEC, "Add a search command that finds files"
             )
 
         assert isinstance(result, CLISpec)
 
-    @pytest.mark.asyncio
     async def test_add_command_preserves_existing(
-        self, generator: SpecGenerator, base_spec: CLISpec
+        self, spec_generator: SpecGenerator
     ) -> None:
         """add_command should preserve existing commands."""
-        with generator.command_agent.override(model=TestModel()):
-            result = await generator.add_command(base_spec, "Add a new command")
+        with spec_generator.command_agent.override(model=_TEST_MODEL):
+            result = await spec_generator.add_command(BASE_SPEC, "Add a new command")
 
         # The existing command should still be there
         assert any(cmd.name == "existing" for cmd in result.commands)
 
-    @pytest.mark.asyncio
+    async def test_add_command_rejects_duplicate_name(
+        self, spec_generator: SpecGenerator
+    ) -> None:
+        """add_command should reject a command whose name already exists."""
+        # TestModel names every generated command "a"
+        spec = CLISpec(
+            name="mytool",
+            description="A test tool",
+            commands=[CommandSpec(name="a", description="Existing command")],
+        )
+        with spec_generator.command_agent.override(model=_TEST_MODEL):
+            with pytest.raises(ValueError, match="Duplicate command names"):
+                await spec_generator.add_command(spec, "Add another command")
+
     async def test_add_command_empty_description_raises(
-        self, generator: SpecGenerator, base_spec: CLISpec
+        self, spec_generator: SpecGenerator
     ) -> None:
         """Empty command description should raise ValueError."""
         with pytest.raises(ValueError, match="description"):
-            await generator.add_command(base_spec, "")
+            await spec_generator.add_command(BASE_SPEC, "")
 
 
 class TestSpecGeneratorSystemPrompt:
     """Tests for system prompt content."""
 
-    def test_system_prompt_mentions_cli_conventions(self) -> None:
-        """System prompt should mention CLI conventions."""
-        gen = SpecGenerator()
-        prompt = gen.get_system_prompt()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def prompt(cls, spec_generator: SpecGenerator) -> str:
+        """Build the system prompt once for every check in the class."""
+        return spec_generator.get_system_prompt()
 
+    def test_system_prompt_mentions_cli_conventions(self, prompt: str) -> None:
+        """System prompt should mention CLI conventions."""
         # Should mention standard options
         assert "-v" in prompt or "verbose" in prompt.lower()
         assert "-o" in prompt or "output" in prompt.lower()
 
-    def test_system_prompt_mentions_naming(self) -> None:
+    def test_system_prompt_mentions_naming(self, prompt: str) -> None:
         """System prompt should mention naming conventions."""
-        gen = SpecGenerator()
-        prompt = gen.get_system_prompt()
-
         # Should mention naming
         assert "name" in prompt.lower()
 
-    def test_system_prompt_mentions_commands(self) -> None:
+    def test_system_prompt_mentions_commands(self, prompt: str) -> None:
         """System prompt should mention command structure."""
-        gen = SpecGenerator()
-        prompt = gen.get_system_prompt()
-
         # Should mention commands
         assert "command" in prompt.lower()
 
@@ -178,30 +220,23 @@ class TestSpecGeneratorSystemPrompt:
 class TestSpecGeneratorValidation:
     """Tests for output validation."""
 
-    @pytest.fixture
-    def generator(self) -> SpecGenerator:
-        """Create a SpecGenerator instance."""
-        return SpecGenerator()
-
-    @pytest.mark.asyncio
     async def test_generated_spec_has_valid_name(
-        self, generator: SpecGenerator
+        self, spec_generator: SpecGenerator
     ) -> None:
         """Generated CLISpec should have valid Python package name."""
-        with generator.agent.override(model=TestModel()):
-            result = await generator.generate("A simple counter tool")
+        with spec_generator.agent.override(model=_TEST_MODEL):
+            result = await spec_generator.generate("A simple counter tool")
 
         # Name should be valid (no hyphens, valid identifier)
         assert result.name.replace("_", "").isalnum() or result.name[0] == "_"
         assert not result.name[0].isdigit()
 
-    @pytest.mark.asyncio
     async def test_generated_spec_has_description(
-        self, generator: SpecGenerator
+        self, spec_generator: SpecGenerator
     ) -> None:
         """Generated CLISpec should have non-empty description."""
-        with generator.agent.override(model=TestModel()):
-            result = await generator.generate("A URL shortener")
+        with spec_generator.agent.override(model=_TEST_MODEL):
+            result = await spec_generator.generate("A URL shortener")
 
         assert result.description
         assert len(result.description) > 0